@@ -0,0 +1,68 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from bot.management._chat import Chat
+from bot.tg.client import TgClient
+from bot.tg.dc import Message
+from bot.tg.sender import MessageQueue
+from todolist import settings
+
+
+class UpdateDispatcher:
+    """Обрабатывает сообщения бота в пуле потоков, сохраняя порядок сообщений внутри одного чата."""
+
+    def __init__(self, message_queue: MessageQueue, workers: int):
+        self.message_queue = message_queue
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bot-dispatcher')
+        self._pending: dict[int, deque[Message]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, message: Message) -> None:
+        """Ставит сообщение в очередь чата и сразу возвращает управление."""
+        chat_id: int = message.chat.id
+        with self._lock:
+            if chat_id in self._pending:
+                # Чат уже обрабатывается: сообщение заберет тот же поток.
+                self._pending[chat_id].append(message)
+                return
+            self._pending[chat_id] = deque([message])
+        self._executor.submit(self._drain, chat_id)
+
+    def _drain(self, chat_id: int) -> None:
+        while True:
+            with self._lock:
+                if not self._pending[chat_id]:
+                    del self._pending[chat_id]
+                    return
+                message: Message = self._pending[chat_id].popleft()
+            close_old_connections()
+            try:
+                chat = Chat(message=message)
+                chat.set_state(tg_client=self.message_queue)
+                chat.state.run()
+            except Exception:
+                self.logger.exception('Failed to process message from chat %s', chat_id)
+            finally:
+                close_old_connections()
+
+
+_dispatcher: UpdateDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_webhook_dispatcher() -> UpdateDispatcher:
+    """Возвращает общий для процесса диспетчер webhook-обновлений, создавая его при первом обращении."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            tg_client = TgClient(token=settings.BOT_TOKEN, pool_maxsize=settings.BOT_CONCURRENCY)
+            message_queue = MessageQueue(
+                tg_client, global_rate=settings.BOT_GLOBAL_RATE, chat_rate=settings.BOT_CHAT_RATE
+            ).start()
+            _dispatcher = UpdateDispatcher(message_queue, workers=settings.BOT_CONCURRENCY)
+        return _dispatcher
@@ -1,13 +1,16 @@
 from bot.management._state import UnverifiedUserState, VerifiedUserState, BaseTgUserState, NewUserState
 from bot.models import TgUser
+from bot.resolver import get_or_create_tg_user
 from bot.tg.client import TgClient
+from bot.tg.sender import MessageQueue
 from bot.tg.dc import Message
 
 
 class Chat:
     """Класс чата с пользователем для изменения состояния"""
-    def __init__(self, message: Message):
+    def __init__(self, message: Message, tg_user: TgUser | None = None):
         self.message = message
+        self.tg_user = tg_user
         self.__state: BaseTgUserState | None = None
 
     @property
@@ -17,17 +20,15 @@ class Chat:
         else:
             raise RuntimeError('''State doesn't exist.''')
 
-    def set_state(self, tg_client: TgClient) -> None:
-        # Проверка юзера на наличие в базе / создание нового.
-        tg_user, created = TgUser.objects.get_or_create(
-            telegram_chat_id=self.message.chat.id,
-            defaults={
-                'telegram_user_id': self.message.from_.id
-            }
-        )
+    def set_state(self, tg_client: TgClient | MessageQueue) -> None:
+        # Проверка юзера на наличие в базе / создание нового, если он не был загружен заранее.
+        if self.tg_user:
+            tg_user, created = self.tg_user, False
+        else:
+            tg_user, created = get_or_create_tg_user(self.message)
         if created:
             self.__state = NewUserState(tg_client=tg_client, tg_user=tg_user)
-        elif not tg_user.user:
+        elif not tg_user.user_id:
             self.__state = UnverifiedUserState(tg_client=tg_client, tg_user=tg_user)
         else:
             self.__state = VerifiedUserState(tg_client=tg_client, tg_user=tg_user, message=self.message)
@@ -1,15 +1,20 @@
+from datetime import timedelta
 from typing import Optional
 
+from django.utils import timezone
+
 from bot.models import TgUser
 from bot.tg.client import TgClient
+from bot.tg.sender import MessageQueue
 from bot.tg.dc import Message
 from goals.models import Goal, GoalCategory
+from todolist import settings
 
 
 class BaseTgUserState:
     """Базовый класс состояния юзера."""
 
-    def __init__(self, tg_user: TgUser, tg_client: TgClient):
+    def __init__(self, tg_user: TgUser, tg_client: TgClient | MessageQueue):
         self.tg_user = tg_user
         self.tg_client = tg_client
         self._text: str | None = None
@@ -30,7 +35,7 @@ class BaseTgUserState:
 class NewUserState(BaseTgUserState):
     """Класс юзера, впервые активировавшего бота"""
 
-    def __init__(self, tg_user: TgUser, tg_client: TgClient):
+    def __init__(self, tg_user: TgUser, tg_client: TgClient | MessageQueue):
         super().__init__(tg_user, tg_client)
         self._text = f'''Добро пожаловать в бот ToDoCon!
 Для продолжения работы необходимо привязать Ваш аккаунт todocon.ga.
@@ -40,19 +45,36 @@ class NewUserState(BaseTgUserState):
 class UnverifiedUserState(BaseTgUserState):
     """Класс юзера, не прошедшего верификацию."""
 
-    def __init__(self, tg_user: TgUser, tg_client: TgClient):
+    def __init__(self, tg_user: TgUser, tg_client: TgClient | MessageQueue):
         super().__init__(tg_user, tg_client)
         self._text = f'Код для верификации: {self.get_verification_code()}.'
 
 
 class VerifiedUserState(BaseTgUserState):
     """Класс верифицированного юзера."""
-    is_create_command: bool = False
-    category_for_create: int | None = None
 
-    def __init__(self, tg_user: TgUser, tg_client: TgClient, message: Message):
+    def __init__(self, tg_user: TgUser, tg_client: TgClient | MessageQueue, message: Message):
         super().__init__(tg_user, tg_client)
         self.message = message
+        # Состояние диалога читается из уже загруженного TgUser; просроченное считается сброшенным.
+        if tg_user.state_expires_at and tg_user.state_expires_at <= timezone.now():
+            tg_user.is_create_command = False
+            tg_user.category_for_create_id = None
+        self.is_create_command: bool = tg_user.is_create_command
+        self.category_for_create: int | None = tg_user.category_for_create_id
+
+    def _save_state(self, is_create_command: bool, category_for_create: int | None) -> None:
+        """Сохраняет состояние диалога, только если оно изменилось."""
+        if (is_create_command, category_for_create) == (self.is_create_command, self.category_for_create):
+            return
+        self.is_create_command = is_create_command
+        self.category_for_create = category_for_create
+        self.tg_user.is_create_command = is_create_command
+        self.tg_user.category_for_create_id = category_for_create
+        self.tg_user.state_expires_at = (
+            timezone.now() + timedelta(seconds=settings.BOT_STATE_TTL) if is_create_command else None
+        )
+        self.tg_user.save(update_fields=('is_create_command', 'category_for_create', 'state_expires_at'))
 
     def run(self) -> None:
         if self.message.text.startswith('/'):
@@ -61,11 +83,11 @@ class VerifiedUserState(BaseTgUserState):
             self._handle_message()
 
     def _handle_message(self) -> None:
-        if VerifiedUserState.is_create_command is False:
+        if self.is_create_command is False:
             self.send_message(
                 text='''Доступные команды:\n/goals — получить список целей\n/create — создать новую цель.'''
             )
-        elif VerifiedUserState.is_create_command and not VerifiedUserState.category_for_create:
+        elif self.is_create_command and not self.category_for_create:
             self._handle_create_command(self.message)
         else:
             self.create_goal()
@@ -90,7 +112,7 @@ class VerifiedUserState(BaseTgUserState):
     def _handle_goals_command(self) -> None:
         """Вывод списка созданных целей юзера."""
         goals: list[str] = list(
-            Goal.objects.filter(user_id=self.tg_user.user.id)
+            Goal.objects.filter(user_id=self.tg_user.user_id, category__is_deleted=False)
             .exclude(status=Goal.Status.archived).values_list('title', flat=True)
         )
 
@@ -100,11 +122,10 @@ class VerifiedUserState(BaseTgUserState):
 
     def _handle_create_command(self, message: Message):
         """Верификация выбранной категории."""
-        categories_id: list[int] = [
-            cat.id for cat in GoalCategory.objects.filter(user_id=self.tg_user.user.id, is_deleted=False)
-        ]
-        if int(message.text) in categories_id:
-            VerifiedUserState.category_for_create = int(message.text)
+        if message.text.isdigit() and GoalCategory.objects.filter(
+                id=int(message.text), user_id=self.tg_user.user_id, is_deleted=False
+        ).exists():
+            self._save_state(is_create_command=True, category_for_create=int(message.text))
             self.send_message(
                 text='''Введите название цели.'''
             )
@@ -115,10 +136,9 @@ class VerifiedUserState(BaseTgUserState):
 
     def create_goal(self):
         """Создание цели и сброс флагов состояния."""
-        goal = Goal.objects.create(user_id=self.tg_user.user.id, category_id=VerifiedUserState.category_for_create,
+        goal = Goal.objects.create(user_id=self.tg_user.user_id, category_id=self.category_for_create,
                                    title=self.message.text)
-        VerifiedUserState.is_create_command = False
-        VerifiedUserState.category_for_create = None
+        self._save_state(is_create_command=False, category_for_create=None)
         self.send_message(
             text=f'''Создана цель {self.message.text} в категории {GoalCategory.objects.get(id=goal.category_id)}.'''
         )
@@ -126,11 +146,13 @@ class VerifiedUserState(BaseTgUserState):
     def _handle_choose_cat_command(self):
         """Вывод списка доступных категорий юзеру."""
         categories: list[str] = [
-            f'{cat.id}) {cat.title}'
-            for cat in GoalCategory.objects.filter(user_id=self.tg_user.user.id, is_deleted=False)
+            f'{cat_id}) {title}'
+            for cat_id, title in GoalCategory.objects.filter(
+                user_id=self.tg_user.user_id, is_deleted=False
+            ).values_list('id', 'title')
         ]
         if categories:
-            VerifiedUserState.is_create_command = True
+            self._save_state(is_create_command=True, category_for_create=None)
             categories_msg: str = '\n'.join(categories)
             self.send_message(
                 text=f'''Выберите категорию:\n{categories_msg}\nДля отмены введите /cancel.'''
@@ -140,8 +162,7 @@ class VerifiedUserState(BaseTgUserState):
 
     def _handle_cancel_create(self):
         """Сброс флага создания категории."""
-        VerifiedUserState.is_create_command = False
-        VerifiedUserState.category_for_create = None
+        self._save_state(is_create_command=False, category_for_create=None)
         self.send_message(
             text='''Создание цели отменено.'''
         )
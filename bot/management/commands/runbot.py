@@ -1,30 +1,154 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from requests import RequestException
 
 from bot.management._chat import Chat
+from bot.models import TgUser
+from bot.resolver import resolve_tg_users
 from bot.tg.client import TgClient
+from bot.tg.dc import Message
+from bot.tg.sender import MessageQueue
 from todolist import settings
 
 
 class Command(BaseCommand):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.tg_client: TgClient = TgClient(token=settings.BOT_TOKEN)
         self.logger = logging.getLogger(__name__)
         self.logger.info('Bot started')
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--async', action='store_true', dest='use_async',
+            help='Обрабатывать чаты параллельно, сохраняя порядок сообщений внутри чата'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.BOT_CONCURRENCY,
+            help='Максимальное число одновременно обрабатываемых сообщений в режиме --async'
+        )
+
     def handle(self, *args, **options):
+        if options['use_async']:
+            self.tg_client = TgClient(token=settings.BOT_TOKEN, pool_maxsize=options['concurrency'])
+        self.start_message_queue()
+        try:
+            if options['use_async']:
+                asyncio.run(self.handle_async(concurrency=options['concurrency']))
+            else:
+                self.poll()
+        finally:
+            # Досылаем уже поставленные в очередь ответы перед выходом.
+            self.message_queue.stop(timeout=10)
+
+    def poll(self) -> None:
         offset: int = 0
         while True:
             # Получение обновлений в бесконечном цикле.
-            res = self.tg_client.get_updates(offset=offset)
+            try:
+                res = self.tg_client.get_updates(offset=offset)
+            except RequestException:
+                # Клиент уже исчерпал повторы с задержкой, продолжаем опрос.
+                continue
+            # Все TgUser пачки обновлений загружаются одним запросом.
+            tg_users: dict[int, TgUser] = resolve_tg_users([item.message for item in res.result])
+            for item in res.result:
+                offset = item.update_id + 1
+                self.logger.info(item.message)
+                try:
+                    self.process_message(item.message, tg_users.get(item.message.chat.id))
+                except Exception:
+                    self.logger.exception('Failed to process message from chat %s', item.message.chat.id)
+
+    def start_message_queue(self) -> None:
+        # Ответы уходят через очередь, поэтому обработка обновлений не ждет доставки.
+        self.message_queue: MessageQueue = MessageQueue(
+            self.tg_client,
+            global_rate=settings.BOT_GLOBAL_RATE,
+            chat_rate=settings.BOT_CHAT_RATE,
+        ).start()
+
+    def process_message(self, message: Message, tg_user: TgUser | None = None) -> None:
+        # Создание экземпляра класса чата и определение состояния.
+        chat = Chat(message=message, tg_user=tg_user)
+        chat.set_state(tg_client=self.message_queue)
+        # Запуск исполнения команд, доступных юзеру каждого состояния.
+        chat.state.run()
+
+    async def handle_async(self, concurrency: int) -> None:
+        """
+        Опрашивает Telegram, не дожидаясь обработки, и раздает сообщения очередям чатов.
+
+        Асинхронный HTTP-клиент здесь ничего не даёт: обработка сообщения — синхронный ORM, которому всё равно
+        нужен поток, ответы отправляет поток MessageQueue, а в event loop остаётся один long-poll getUpdates.
+        Поэтому TgClient на requests (с его пулом соединений и повторами) работает в пуле потоков, размер
+        которого (--concurrency) ограничивает и число соединений с БД.
+        """
+        loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='runbot')
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._pending: dict[int, int] = {}
+        offset: int = 0
+        while True:
+            try:
+                res = await loop.run_in_executor(None, partial(self.tg_client.get_updates, offset=offset))
+            except RequestException:
+                continue
+            # Как и в poll(), TgUser пачки загружаются одним запросом, но только для чатов без необработанных
+            # сообщений: те ещё могут изменить TgUser, и он перечитывается при обработке (get_or_create_tg_user).
+            messages: list[Message] = [
+                item.message for item in res.result if not self._pending.get(item.message.chat.id)
+            ]
+            tg_users: dict[int, TgUser] = await loop.run_in_executor(self._executor, self._resolve_in_thread, messages)
             for item in res.result:
                 offset = item.update_id + 1
                 self.logger.info(item.message)
-                # Создание экземпляра класса чата и определение состояния.
-                chat = Chat(message=item.message)
-                chat.set_state(tg_client=self.tg_client)
-                # Запуск исполнения команд, доступных юзеру каждого состояния.
-                chat.state.run()
+                self.dispatch(item.message, tg_users.get(item.message.chat.id))
+
+    def dispatch(self, message: Message, tg_user: TgUser | None = None) -> None:
+        chat_id: int = message.chat.id
+        if chat_id not in self._queues:
+            self._queues[chat_id] = asyncio.Queue()
+            self._workers[chat_id] = asyncio.create_task(self.chat_worker(chat_id, self._queues[chat_id]))
+        # Второе сообщение чата в пачке: первое может изменить загруженный TgUser.
+        if self._pending.get(chat_id):
+            tg_user = None
+        self._pending[chat_id] = self._pending.get(chat_id, 0) + 1
+        self._queues[chat_id].put_nowait((message, tg_user))
+
+    async def chat_worker(self, chat_id: int, queue: asyncio.Queue) -> None:
+        """Последовательно обрабатывает сообщения одного чата и завершается после простоя."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                message, tg_user = await asyncio.wait_for(queue.get(), timeout=settings.BOT_CHAT_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                del self._queues[chat_id], self._workers[chat_id], self._pending[chat_id]
+                return
+            try:
+                await loop.run_in_executor(self._executor, self._process_in_thread, message, tg_user)
+            except Exception:
+                self.logger.exception('Failed to process message from chat %s', chat_id)
+            finally:
+                self._pending[chat_id] -= 1
+
+    def _resolve_in_thread(self, messages: list[Message]) -> dict[int, TgUser]:
+        close_old_connections()
+        try:
+            return resolve_tg_users(messages)
+        finally:
+            close_old_connections()
+
+    def _process_in_thread(self, message: Message, tg_user: TgUser | None) -> None:
+        close_old_connections()
+        try:
+            self.process_message(message, tg_user)
+        finally:
+            close_old_connections()
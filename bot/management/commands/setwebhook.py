@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bot.tg.client import TgClient
+from todolist import settings
+
+
+class Command(BaseCommand):
+    help = 'Регистрирует webhook бота в Telegram (или удаляет его с --delete, возвращая режим runbot).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', nargs='?', help='Публичный URL bot/webhook')
+        parser.add_argument('--delete', action='store_true', help='Удалить webhook')
+
+    def handle(self, *args, **options):
+        tg_client = TgClient(token=settings.BOT_TOKEN)
+        if options['delete']:
+            result = tg_client.delete_webhook()
+        else:
+            if not options['url']:
+                raise CommandError('URL is required')
+            if not settings.BOT_WEBHOOK_SECRET:
+                raise CommandError('BOT_WEBHOOK_SECRET is not set')
+            result = tg_client.set_webhook(url=options['url'], secret_token=settings.BOT_WEBHOOK_SECRET)
+        if not result.get('ok'):
+            raise CommandError(result.get('description', 'Telegram returned an error'))
+        self.stdout.write(self.style.SUCCESS(result.get('description', 'OK')))
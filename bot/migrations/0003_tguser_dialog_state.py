@@ -0,0 +1,30 @@
+# Generated by Django 4.1.13 on 2026-10-18 10:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0002_indexes'),
+        ('bot', '0002_alter_tguser_telegram_chat_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tguser',
+            name='category_for_create',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='goals.goalcategory'),
+        ),
+        migrations.AddField(
+            model_name='tguser',
+            name='is_create_command',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='tguser',
+            name='state_expires_at',
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+    ]
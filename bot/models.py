@@ -3,6 +3,7 @@ import os
 from django.db import models
 
 from core.models import User
+from goals.models import GoalCategory
 
 
 class TgUser(models.Model):
@@ -11,6 +12,13 @@ class TgUser(models.Model):
     user = models.ForeignKey(User, null=True, on_delete=models.CASCADE, blank=True)
     verification_code = models.CharField(max_length=80, null=True, blank=True, default=None)
 
+    # Состояние диалога создания цели; хранится в строке чата, чтобы бот можно было запускать в нескольких процессах.
+    is_create_command = models.BooleanField(default=False)
+    category_for_create = models.ForeignKey(
+        GoalCategory, null=True, blank=True, on_delete=models.SET_NULL, related_name='+'
+    )
+    state_expires_at = models.DateTimeField(null=True, blank=True, default=None)
+
     @staticmethod
     def _gen_code():
         return os.urandom(15).hex()
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+
+from bot.models import TgUser
+from bot.tg.dc import Message
+from todolist import settings
+
+TG_USER_CACHE_KEY = 'bot:tg_user:{chat_id}'
+
+
+def _key(chat_id: int | str) -> str:
+    return TG_USER_CACHE_KEY.format(chat_id=chat_id)
+
+
+def cache_tg_user(tg_user: TgUser) -> None:
+    if settings.BOT_TG_USER_CACHE_TTL:
+        cache.set(_key(tg_user.telegram_chat_id), tg_user, settings.BOT_TG_USER_CACHE_TTL)
+
+
+def invalidate_tg_user(chat_id: int | str) -> None:
+    cache.delete(_key(chat_id))
+
+
+def get_or_create_tg_user(message: Message) -> tuple[TgUser, bool]:
+    """Возвращает TgUser чата из кеша или из базы, создавая его для нового чата."""
+    if settings.BOT_TG_USER_CACHE_TTL and (tg_user := cache.get(_key(message.chat.id))):
+        return tg_user, False
+    tg_user, created = TgUser.objects.get_or_create(
+        telegram_chat_id=message.chat.id,
+        defaults={
+            'telegram_user_id': message.from_.id
+        }
+    )
+    if not created:
+        cache_tg_user(tg_user)
+    return tg_user, created
+
+
+def resolve_tg_users(messages: list[Message]) -> dict[int, TgUser]:
+    """Загружает TgUser для пачки сообщений одним запросом; новые чаты в результат не попадают."""
+    chat_ids: set[int] = {message.chat.id for message in messages}
+    resolved: dict[int, TgUser] = {}
+    if settings.BOT_TG_USER_CACHE_TTL:
+        cached: dict[str, TgUser] = cache.get_many([_key(chat_id) for chat_id in chat_ids])
+        resolved = {int(tg_user.telegram_chat_id): tg_user for tg_user in cached.values()}
+
+    if missing := chat_ids - resolved.keys():
+        loaded: dict[int, TgUser] = {
+            int(tg_user.telegram_chat_id): tg_user
+            for tg_user in TgUser.objects.filter(telegram_chat_id__in=[str(chat_id) for chat_id in missing])
+        }
+        if settings.BOT_TG_USER_CACHE_TTL and loaded:
+            cache.set_many(
+                {_key(chat_id): tg_user for chat_id, tg_user in loaded.items()}, settings.BOT_TG_USER_CACHE_TTL
+            )
+        resolved.update(loaded)
+    return resolved
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from bot.models import TgUser
+from bot.resolver import cache_tg_user, invalidate_tg_user
+
+
+@receiver(post_save, sender=TgUser)
+def refresh_cached_tg_user(sender, instance: TgUser, **kwargs) -> None:
+    # Запись в кеш сразу после сохранения: верификация и смена состояния диалога видны следующему сообщению.
+    invalidate_tg_user(instance.telegram_chat_id)
+    cache_tg_user(instance)
+
+
+@receiver(post_delete, sender=TgUser)
+def invalidate_deleted_tg_user(sender, instance: TgUser, **kwargs) -> None:
+    invalidate_tg_user(instance.telegram_chat_id)
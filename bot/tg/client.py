@@ -1,25 +1,63 @@
-import requests
 import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from bot.tg.dc import GetUpdatesResponse, SendMessageResponse
 
 
+@dataclass
+class TgClientStats:
+    """Счетчики запросов клиента: количество, повторы, ошибки и задержка в секундах."""
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.requests if self.requests else 0.0
+
+
 class TgClient:
-    def __init__(self, token: str):
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, token: str, base_url: str = 'https://api.telegram.org', connect_timeout: float = 5,
+                 read_timeout: float = 15, max_retries: int = 5, backoff_factor: float = 0.5,
+                 backoff_max: float = 30, pool_maxsize: int = 10):
         self.token = token
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+        # Одна сессия на клиента: TCP/TLS-соединения переиспользуются между запросами.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.stats = TgClientStats()
+        self._stats_lock = threading.Lock()
 
     def get_url(self, method: str):
-        return f'https://api.telegram.org/bot{self.token}/{method}'
+        return f'{self.base_url}/bot{self.token}/{method}'
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
-        url = self.get_url('getUpdates')
         params = {
             'offset': offset,
             'timeout': timeout
         }
 
         try:
-            response = requests.get(url=url, params=params)
+            # Long polling: сервер держит соединение до timeout секунд, поэтому ожидание ответа длиннее.
+            response = self._request('GET', 'getUpdates', params=params, read_timeout=timeout + self.read_timeout)
         except Exception as e:
             logging.error('Failed to get updates')
             raise e
@@ -28,15 +66,92 @@ class TgClient:
             return GetUpdatesResponse(**response.json())
 
     def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
-        url = self.get_url('sendMessage')
         data = {
             'chat_id': chat_id,
             'text': text
         }
         try:
-            response = requests.post(url=url, data=data)
+            response = self._request('POST', 'sendMessage', data=data)
         except Exception as e:
             logging.error('Failed to send message')
             raise e
         else:
             return SendMessageResponse(**response.json())
+
+    def set_webhook(self, url: str, secret_token: str) -> dict:
+        data = {
+            'url': url,
+            'secret_token': secret_token,
+        }
+        try:
+            response = self._request('POST', 'setWebhook', data=data)
+        except Exception as e:
+            logging.error('Failed to set webhook')
+            raise e
+        else:
+            return response.json()
+
+    def delete_webhook(self) -> dict:
+        try:
+            response = self._request('POST', 'deleteWebhook')
+        except Exception as e:
+            logging.error('Failed to delete webhook')
+            raise e
+        else:
+            return response.json()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _request(self, http_method: str, method: str, read_timeout: float | None = None,
+                 **kwargs) -> requests.Response:
+        """Выполняет запрос, повторяя его с экспоненциальной задержкой при сетевых ошибках, 429 и 5xx."""
+        url = self.get_url(method)
+        timeout = (self.connect_timeout, read_timeout or self.read_timeout)
+        attempt: int = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = self.session.request(http_method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(started)
+                if attempt >= self.max_retries:
+                    self._record_failure()
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                self._record(started)
+                if response.status_code not in self.retry_statuses:
+                    return response
+                if attempt >= self.max_retries:
+                    self._record_failure()
+                    response.raise_for_status()
+                delay = self._retry_after(response) or self._backoff(attempt)
+
+            attempt += 1
+            with self._stats_lock:
+                self.stats.retries += 1
+            logging.warning('Telegram %s failed, retry %s in %.2fs', method, attempt, delay)
+            time.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: случайная задержка от 0 до backoff_factor * 2^attempt, но не больше backoff_max."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float | None:
+        try:
+            return float(response.json()['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _record(self, started: float) -> None:
+        latency = time.monotonic() - started
+        with self._stats_lock:
+            self.stats.requests += 1
+            self.stats.latency_total += latency
+            self.stats.latency_max = max(self.stats.latency_max, latency)
+
+    def _record_failure(self) -> None:
+        with self._stats_lock:
+            self.stats.failures += 1
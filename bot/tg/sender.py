@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from bot.tg.client import TgClient
+
+MAX_MESSAGE_LENGTH = 4096
+
+
+class TokenBucket:
+    """Ограничитель частоты: rate токенов в секунду, не больше capacity накопленных."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Сколько секунд ждать до появления токена."""
+        self._refill()
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+    @property
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+def split_text(text: str, limit: int = MAX_MESSAGE_LENGTH) -> tuple[str, str]:
+    """Отрезает от текста первую часть не длиннее limit, по возможности по переводу строки."""
+    if len(text) <= limit:
+        return text, ''
+    cut: int = text.rfind('\n', 0, limit + 1)
+    if cut <= 0:
+        cut = limit
+    return text[:cut], text[cut:].lstrip('\n')
+
+
+class MessageQueue:
+    """Очередь исходящих сообщений между состояниями бота и TgClient.
+
+    Сообщения отправляются фоновыми потоками с учетом общего лимита и лимита на чат (token bucket).
+    Несколько ожидающих сообщений одному чату склеиваются в одно, длинные тексты режутся по 4096 символов.
+    """
+
+    def __init__(self, tg_client: TgClient, global_rate: float = 30, chat_rate: float = 1, chat_burst: float = 3,
+                 workers: int = 4, clock: Callable[[], float] = time.monotonic):
+        self.tg_client = tg_client
+        self.workers = workers
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._global_bucket = TokenBucket(global_rate, global_rate, clock)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        self._pending: OrderedDict[int, list[str]] = OrderedDict()
+        # Чаты, сообщение которым сейчас отправляется: так сохраняется порядок внутри чата.
+        self._in_flight: set[int] = set()
+        self._condition = threading.Condition()
+        self._stopping: bool = False
+        self._threads: list[threading.Thread] = []
+
+    def send_message(self, chat_id: int, text: str | None) -> None:
+        """Ставит сообщение в очередь и сразу возвращает управление."""
+        if not text:
+            return
+        with self._condition:
+            self._pending.setdefault(chat_id, []).append(text)
+            self._condition.notify()
+
+    def start(self) -> 'MessageQueue':
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'tg-sender-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Дожидается отправки уже поставленных в очередь сообщений и останавливает потоки."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopping and not self._pending:
+                        return
+                    chat_id, wait = self._next_ready_chat()
+                    if chat_id is not None:
+                        break
+                    self._condition.wait(timeout=wait)
+                text: str = self._take_message(chat_id)
+                self._global_bucket.consume()
+                self._chat_buckets[chat_id].consume()
+                self._in_flight.add(chat_id)
+
+            try:
+                self.tg_client.send_message(chat_id=chat_id, text=text)
+            except Exception:
+                self.logger.exception('Failed to deliver message to chat %s', chat_id)
+            finally:
+                with self._condition:
+                    self._in_flight.discard(chat_id)
+                    self._condition.notify_all()
+
+    def _next_ready_chat(self) -> tuple[int | None, float | None]:
+        """Возвращает первый чат, которому можно отправить сообщение, либо время ожидания."""
+        if not self._pending:
+            self._prune_buckets()
+            return None, None
+        if wait := self._global_bucket.delay():
+            return None, wait
+        wait = None
+        for chat_id in self._pending:
+            if chat_id in self._in_flight:
+                continue
+            bucket = self._chat_buckets.setdefault(
+                chat_id, TokenBucket(self.chat_rate, self.chat_burst, self.clock)
+            )
+            if not (delay := bucket.delay()):
+                return chat_id, None
+            wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    def _take_message(self, chat_id: int) -> str:
+        """Забирает из очереди чата одно сообщение, склеивая подряд идущие тексты в пределах лимита."""
+        texts: list[str] = self._pending.pop(chat_id)
+        message, rest = split_text(texts.pop(0))
+        if rest:
+            texts.insert(0, rest)
+        else:
+            while texts and len(message) + 2 + len(texts[0]) <= MAX_MESSAGE_LENGTH:
+                message = f'{message}\n\n{texts.pop(0)}'
+        if texts:
+            # Остаток встает в конец очереди, чтобы другие чаты не ждали длинную переписку.
+            self._pending[chat_id] = texts
+        return message
+
+    def _prune_buckets(self) -> None:
+        for chat_id in [chat_id for chat_id, bucket in self._chat_buckets.items() if bucket.is_full]:
+            del self._chat_buckets[chat_id]
@@ -1,9 +1,18 @@
+import logging
+import secrets
+
+from django.core.cache import cache
+from pydantic import ValidationError
+from rest_framework import status
 from rest_framework.generics import UpdateAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from bot.dispatcher import get_webhook_dispatcher
 from bot.serializers import TgUserSerializer
 from bot.tg.client import TgClient
+from bot.tg.dc import UpdateObj
 from todolist import settings
 
 
@@ -23,3 +32,29 @@ class BotVerificationView(UpdateAPIView):
         tg_client.send_message(chat_id=tg_user.telegram_chat_id,
                                text='''Аккаунт успешно привязан!\n
     Доступные команды:\n"/goals" — получить список целей\n"/create" — создать новую цель''')
+
+
+class BotWebhookView(APIView):
+    """Принимает обновления Telegram и передает их на обработку, не дожидаясь ее окончания."""
+    authentication_classes = []
+    permission_classes = []
+    secret_header = 'X-Telegram-Bot-Api-Secret-Token'
+    update_cache_key = 'bot:update:{update_id}'
+
+    def post(self, request, *args, **kwargs):
+        if not settings.BOT_WEBHOOK_SECRET or not secrets.compare_digest(
+                request.headers.get(self.secret_header, ''), settings.BOT_WEBHOOK_SECRET
+        ):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            update = UpdateObj(**request.data)
+        except (ValidationError, TypeError):
+            # Неподдерживаемые обновления подтверждаются, иначе Telegram будет присылать их повторно.
+            logging.getLogger(__name__).info('Skipped unsupported update: %s', request.data)
+            return Response(status=status.HTTP_200_OK)
+
+        # Telegram может доставить обновление повторно, если не дождался ответа.
+        if cache.add(self.update_cache_key.format(update_id=update.update_id), True, timeout=60 * 60):
+            get_webhook_dispatcher().submit(update.message)
+        return Response(status=status.HTTP_200_OK)
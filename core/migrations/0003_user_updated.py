@@ -0,0 +1,20 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_user_avatar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='updated',
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now, verbose_name='Дата последнего обновления'
+            ),
+            preserve_default=False,
+        ),
+    ]
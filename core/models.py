@@ -4,3 +4,5 @@ from django.db import models
 
 class User(AbstractUser):
     avatar = models.ImageField(upload_to='avatars/', default=None, null=True, blank=True)
+    # Меняется при сохранении профиля; по нему ETag списков goals замечает смену вложенных данных автора.
+    updated = models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')
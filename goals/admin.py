@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from goals.models import GoalCategory, Goal, GoalComment, Board
+from goals.models import GoalCategory, Goal, GoalComment, Board, CascadeJob, ArchivedGoal
 
 
 @admin.register(GoalCategory)
@@ -32,3 +32,18 @@ class BoardAdmin(admin.ModelAdmin):
     list_display = ('participants', 'title', )
     readonly_fields = ('created', 'updated',)
     list_filter = ('is_deleted',)
+
+
+@admin.register(CascadeJob)
+class CascadeJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'object_id', 'status', 'processed', 'total', 'attempts', 'run_after')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('created', 'updated',)
+
+
+@admin.register(ArchivedGoal)
+class ArchivedGoalAdmin(admin.ModelAdmin):
+    list_display = ('id', 'title', 'user', 'category', 'priority', 'archived_at')
+    list_display_links = ('title',)
+    search_fields = ('title', 'description')
+    readonly_fields = ('created', 'updated', 'archived_at')
@@ -0,0 +1,136 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from rest_framework import status
+
+from core.models import User
+from goals import statistics, search
+from goals.membership import get_board_roles, WRITE_ROLES
+from goals.models import Goal, GoalCategory, GoalComment
+from goals.response_cache import bump_board_versions
+from goals.serializers import GoalBatchDataSerializer
+
+
+class GoalBatch:
+    """
+    Применяет пачку операций create/update/archive над целями.
+
+    Доступ к категориям и целям проверяется одним запросом на всю пачку, запись идёт через
+    bulk_create/bulk_update в одной транзакции. Ошибочные операции не мешают остальным:
+    для каждой возвращается свой результат со статусом.
+    """
+
+    def __init__(self, user: User, operations: list[dict]):
+        self.user = user
+        self.operations = operations
+        self.roles: dict[int, int] = get_board_roles(user.id)
+        self.results: list[dict] = [{} for _ in operations]
+
+    def run(self) -> list[dict]:
+        data = [self._validate(index, operation) for index, operation in enumerate(self.operations)]
+        categories = self._load_categories(attrs['category'] for attrs in data if attrs and 'category' in attrs)
+        goals = self._load_goals(operation['id'] for operation in self.operations if 'id' in operation)
+
+        created: list[Goal] = []
+        updated: dict[int, tuple[Goal, set[str]]] = {}
+        archived: dict[int, int] = {}
+        for index, (operation, attrs) in enumerate(zip(self.operations, data)):
+            if self.results[index]:
+                continue
+            if operation['action'] == 'create':
+                goal = self._apply(index, Goal(user=self.user), attrs, categories)
+                if goal:
+                    created.append(goal)
+                continue
+
+            goal = goals.get(operation['id'])
+            if goal is None:
+                self._fail(index, status.HTTP_404_NOT_FOUND)
+            elif goal.id in archived or goal.id in updated:
+                self._fail(index, status.HTTP_400_BAD_REQUEST, {'id': 'Цель уже встречается в этой пачке'})
+            elif self.roles.get(goal.board_id) not in WRITE_ROLES:
+                self._fail(index, status.HTTP_403_FORBIDDEN)
+            elif operation['action'] == 'archive':
+                archived[goal.id] = goal.board_id
+                self.results[index] = {'status': status.HTTP_200_OK, 'id': goal.id}
+            elif self._apply(index, goal, attrs, categories):
+                updated[goal.id] = (goal, set(attrs) | ({'board'} if 'category' in attrs else set()))
+                self.results[index] = {'status': status.HTTP_200_OK, 'id': goal.id}
+
+        self._write(created, updated, archived)
+        for goal in created:
+            self.results[goal._batch_index] = {'status': status.HTTP_201_CREATED, 'id': goal.id}
+        return self.results
+
+    def _validate(self, index: int, operation: dict) -> dict | None:
+        if operation['action'] == 'archive':
+            return None
+        serializer = GoalBatchDataSerializer(data=operation['data'], partial=operation['action'] == 'update')
+        if not serializer.is_valid():
+            self._fail(index, status.HTTP_400_BAD_REQUEST, serializer.errors)
+            return None
+        return dict(serializer.validated_data)
+
+    def _load_categories(self, category_ids) -> dict[int, int]:
+        return dict(GoalCategory.objects.filter(
+            id__in=set(category_ids), board_id__in=self.roles, is_deleted=False
+        ).values_list('id', 'board_id'))
+
+    def _load_goals(self, goal_ids) -> dict[int, Goal]:
+        goals = Goal.objects.filter(
+            id__in=set(goal_ids), board_id__in=self.roles, category__is_deleted=False
+        ).exclude(status=Goal.Status.archived)
+        return {goal.id: goal for goal in goals}
+
+    def _apply(self, index: int, goal: Goal, attrs: dict, categories: dict[int, int]) -> Goal | None:
+        if 'category' in attrs:
+            board_id = categories.get(attrs['category'])
+            if board_id is None:
+                self._fail(index, status.HTTP_400_BAD_REQUEST, {'category': 'Категория не найдена'})
+                return None
+            if self.roles.get(board_id) not in WRITE_ROLES:
+                self._fail(index, status.HTTP_403_FORBIDDEN)
+                return None
+            goal.category_id, goal.board_id = attrs['category'], board_id
+        for field, value in attrs.items():
+            if field != 'category':
+                setattr(goal, field, value)
+        goal._batch_index = index
+        return goal
+
+    def _fail(self, index: int, status_code: int, errors=None) -> None:
+        self.results[index] = {'status': status_code}
+        if errors is not None:
+            self.results[index]['errors'] = errors
+
+    @staticmethod
+    def _write(created: list[Goal], updated: dict[int, tuple[Goal, set[str]]], archived: dict[int, int]) -> None:
+        # bulk-операции обходят Goal.save и сигналы, поэтому статистика, board_id комментариев
+        # и search_vector обновляются здесь явно.
+        goals = [goal for goal, _ in updated.values()]
+        fields = set().union(*(fields for _, fields in updated.values())) | {'updated'}
+        if 'status' in fields:
+            fields.add('archived_at')
+        moved = [goal.id for goal in goals if goal._statistic_key and goal._statistic_key[1] != goal.board_id]
+        boards = {goal.board_id for goal in [*created, *goals]} | {goal._statistic_key[1] for goal in goals}
+        boards |= set(archived.values())
+        searchable = {goal.id for goal, fields in updated.values() if fields & set(search.SEARCH_FIELDS)}
+        now = timezone.now()
+        for goal in goals:
+            goal.updated = now
+        for goal in [*created, *goals]:
+            goal.sync_archived_at()
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(created)
+            if goals:
+                Goal.objects.bulk_update(goals, fields)
+            statistics.goals_saved([*created, *goals])
+            if moved:
+                GoalComment.objects.filter(goal_id__in=moved).update(board_id=Subquery(
+                    Goal.objects.filter(id=OuterRef('goal_id')).values('board_id')[:1]
+                ))
+            search.update_search_vector(Goal.objects.filter(id__in=searchable | {goal.id for goal in created}))
+            if archived:
+                statistics.archive_goals(Goal.objects.filter(id__in=archived))
+            bump_board_versions(*boards)
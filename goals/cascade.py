@@ -0,0 +1,83 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from goals import statistics
+from goals.models import CascadeJob, Goal, GoalCategory
+from goals.response_cache import bump_board_versions
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(kind: str, object_id: int) -> CascadeJob:
+    """Ставит архивацию целей доски или категории в очередь; вызывается в транзакции удаления и не читает цели."""
+    return CascadeJob.objects.create(kind=kind, object_id=object_id)
+
+
+def claim_next_job() -> CascadeJob | None:
+    """Берёт в работу очередную задачу или задачу, брошенную упавшим воркером."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.CASCADE_LOCK_TIMEOUT)
+    with transaction.atomic():
+        # На PostgreSQL воркеры не ждут друг друга на одной строке; SQLite select_for_update игнорирует.
+        job: CascadeJob | None = CascadeJob.objects.select_for_update(skip_locked=True).filter(
+            Q(status=CascadeJob.Status.pending, run_after__lte=now) |
+            Q(status=CascadeJob.Status.running, locked_at__lt=stale)
+        ).order_by('id').first()
+        if job is not None:
+            job.status, job.locked_at, job.attempts = CascadeJob.Status.running, now, job.attempts + 1
+            job.save(update_fields=('status', 'locked_at', 'attempts', 'updated'))
+    return job
+
+
+def run_job(job: CascadeJob, chunk_size: int | None = None) -> None:
+    """Выполняет задачу; при ошибке откладывает повтор с экспоненциальной задержкой или помечает failed."""
+    try:
+        _process(job, chunk_size or settings.CASCADE_CHUNK_SIZE)
+    except Exception as error:
+        logger.exception('Cascade job %s failed', job.id)
+        job.last_error = repr(error)
+        if job.attempts >= settings.CASCADE_MAX_ATTEMPTS:
+            job.status = CascadeJob.Status.failed
+        else:
+            job.status = CascadeJob.Status.pending
+            job.run_after = timezone.now() + timedelta(seconds=settings.CASCADE_RETRY_DELAY * 2 ** (job.attempts - 1))
+        job.save(update_fields=('status', 'last_error', 'run_after', 'updated'))
+
+
+def _goals(job: CascadeJob) -> QuerySet:
+    if job.kind == CascadeJob.Kind.board:
+        return Goal.objects.filter(board_id=job.object_id)
+    return Goal.objects.filter(category_id=job.object_id)
+
+
+def _board_id(job: CascadeJob) -> int:
+    if job.kind == CascadeJob.Kind.board:
+        return job.object_id
+    return GoalCategory.objects.values_list('board_id', flat=True).get(id=job.object_id)
+
+
+def _process(job: CascadeJob, chunk_size: int) -> None:
+    """Архивирует цели порциями по id; каждая порция в своей транзакции, прогресс сохраняется вместе с ней."""
+    goals: QuerySet = _goals(job).exclude(status=Goal.Status.archived)
+    board_id: int = _board_id(job)
+    if job.total is None:
+        job.total = goals.count()
+        job.save(update_fields=('total', 'updated'))
+    while job.status == CascadeJob.Status.running:
+        with transaction.atomic():
+            ids: list[int] = list(
+                goals.filter(id__gt=job.cursor).order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if ids:
+                job.processed += statistics.archive_goals(Goal.objects.filter(id__in=ids))
+                job.cursor = ids[-1]
+            if len(ids) < chunk_size:
+                job.status = CascadeJob.Status.done
+            job.locked_at = timezone.now()
+            job.save(update_fields=('cursor', 'processed', 'status', 'locked_at', 'updated'))
+            bump_board_versions(board_id)
@@ -0,0 +1,80 @@
+from collections import Counter
+from datetime import datetime
+
+from django.db import transaction
+
+from goals import statistics
+from goals.models import ArchivedGoal, ArchivedGoalComment, Goal, GoalComment
+from goals.response_cache import bump_board_versions
+
+
+def move_chunk(cutoff: datetime, chunk_size: int) -> int:
+    """
+    Переносит в архивные таблицы порцию целей, находящихся в архиве с момента раньше cutoff, вместе с комментариями.
+
+    Порция переносится одной транзакцией, поэтому прерванный запуск не оставляет наполовину перенесённых целей
+    и повторный запуск просто продолжает с оставшихся. Возвращает число перенесённых целей.
+    """
+    with transaction.atomic():
+        # skip_locked: параллельно запущенные команды берут разные порции, а не ждут друг друга.
+        goals: list[Goal] = list(
+            Goal.objects.select_for_update(skip_locked=True).defer('search_vector')
+            .filter(status=Goal.Status.archived, archived_at__lt=cutoff).order_by('id')[:chunk_size]
+        )
+        if not goals:
+            return 0
+        ids: list[int] = [goal.id for goal in goals]
+        ArchivedGoal.objects.bulk_create([
+            ArchivedGoal(
+                id=goal.id, user_id=goal.user_id, category_id=goal.category_id, board_id=goal.board_id,
+                title=goal.title, description=goal.description, priority=goal.priority, due_date=goal.due_date,
+                created=goal.created, updated=goal.updated,
+            )
+            for goal in goals
+        ])
+        comments = GoalComment.objects.filter(goal_id__in=ids)
+        ArchivedGoalComment.objects.bulk_create([
+            ArchivedGoalComment(
+                id=comment.id, goal_id=comment.goal_id, user_id=comment.user_id, text=comment.text,
+                created=comment.created, updated=comment.updated,
+            )
+            for comment in comments.iterator()
+        ])
+        # Обычный delete() отправил бы post_delete на каждую строку, а это запрос к статистике на каждую цель;
+        # статистику и версии досок обновляем ниже одной пачкой.
+        comments._raw_delete(comments.db)
+        moved = Goal.objects.filter(id__in=ids)
+        moved._raw_delete(moved.db)
+        deltas: Counter[statistics.StatisticKey] = Counter()
+        for goal in goals:
+            deltas[goal.statistic_key] -= 1
+        statistics.apply_deltas(deltas)
+        bump_board_versions(*{goal.board_id for goal in goals})
+    return len(goals)
+
+
+def restore(archived: ArchivedGoal) -> Goal:
+    """Возвращает цель с комментариями из архивных таблиц в рабочие со статусом «К выполнению»."""
+    with transaction.atomic():
+        goal = Goal(
+            id=archived.id, user_id=archived.user_id, category_id=archived.category_id, title=archived.title,
+            description=archived.description, priority=archived.priority, due_date=archived.due_date,
+            status=Goal.Status.to_do,
+        )
+        # save() обновляет статистику, поисковый вектор и версии досок через сигналы.
+        goal.save(force_insert=True)
+        # auto_now_add перезаписывает дату создания при вставке, исходную возвращаем отдельным UPDATE.
+        Goal.objects.filter(id=goal.id).update(created=archived.created)
+        goal.created = archived.created
+
+        archived_comments: list[ArchivedGoalComment] = list(archived.comments.all())
+        comments: list[GoalComment] = GoalComment.objects.bulk_create([
+            GoalComment(id=comment.id, goal=goal, board_id=goal.board_id, user_id=comment.user_id, text=comment.text)
+            for comment in archived_comments
+        ])
+        if comments:
+            for comment, source in zip(comments, archived_comments):
+                comment.created, comment.updated = source.created, source.updated
+            GoalComment.objects.bulk_update(comments, fields=('created', 'updated'))
+        archived.delete()
+    return goal
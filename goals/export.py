@@ -0,0 +1,102 @@
+import csv
+import json
+import zlib
+from datetime import date
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from goals.membership import get_board_roles
+from goals.models import Board, GoalCategory, Goal, GoalComment
+
+# Колонка выгрузки -> поле для values_list().
+BOARD_FIELDS: dict[str, str] = {'id': 'id', 'title': 'title', 'created': 'created', 'updated': 'updated'}
+CATEGORY_FIELDS: dict[str, str] = {
+    'id': 'id', 'board': 'board_id', 'title': 'title', 'user': 'user__username', 'created': 'created',
+    'updated': 'updated',
+}
+GOAL_FIELDS: dict[str, str] = {
+    'id': 'id', 'board': 'board_id', 'category': 'category_id', 'title': 'title', 'description': 'description',
+    'status': 'status', 'priority': 'priority', 'due_date': 'due_date', 'user': 'user__username',
+    'created': 'created', 'updated': 'updated',
+}
+COMMENT_FIELDS: dict[str, str] = {
+    'id': 'id', 'board': 'board_id', 'goal': 'goal_id', 'text': 'text', 'user': 'user__username',
+    'created': 'created', 'updated': 'updated',
+}
+CSV_COLUMNS: tuple[str, ...] = (
+    'type', 'id', 'board', 'category', 'goal', 'title', 'description', 'text', 'status', 'priority', 'due_date',
+    'user', 'created', 'updated',
+)
+CONTENT_TYPES: dict[str, str] = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# Строки склеиваются в куски такого размера: отдавать каждую строку отдельным чанком слишком дорого.
+BUFFER_SIZE = 64 * 1024
+
+
+def export_rows(user_id: int) -> Iterator[dict]:
+    """Доски, категории, цели и комментарии, которые пользователь видит в API, в порядке вложенности."""
+    board_ids: list[int] = list(get_board_roles(user_id))
+    boards = Board.objects.filter(id__in=board_ids, is_deleted=False)
+    goals = Goal.objects.filter(board__in=boards, category__is_deleted=False).exclude(status=Goal.Status.archived)
+    yield from _rows('board', boards, BOARD_FIELDS)
+    yield from _rows('category', GoalCategory.objects.filter(board__in=boards, is_deleted=False), CATEGORY_FIELDS)
+    yield from _rows('goal', goals, GOAL_FIELDS)
+    yield from _rows('comment', GoalComment.objects.filter(goal__in=goals), COMMENT_FIELDS)
+
+
+def stream(user_id: int, file_format: str, compress: bool = False) -> Iterator[bytes]:
+    lines: Iterable[str] = _ndjson(export_rows(user_id)) if file_format == 'ndjson' else _csv(export_rows(user_id))
+    chunks: Iterator[bytes] = _buffered(lines)
+    return _gzip(chunks) if compress else chunks
+
+
+def _rows(kind: str, queryset: QuerySet, fields: dict[str, str]) -> Iterator[dict]:
+    # iterator() читает серверным курсором (на PostgreSQL) порциями, так что память не растёт с объёмом выгрузки.
+    rows = queryset.order_by('id').values_list(*fields.values()).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    for values in rows:
+        yield {'type': kind, **dict(zip(fields, values))}
+
+
+def _ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: возвращает записанную строку вместо записи."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv(rows: Iterable[dict]) -> Iterator[str]:
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_COLUMNS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow({
+            column: value.isoformat() if isinstance(value, date) else value for column, value in row.items()
+        })
+
+
+def _buffered(lines: Iterable[str]) -> Iterator[bytes]:
+    buffer: list[str] = []
+    size: int = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= BUFFER_SIZE:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
@@ -1,8 +1,15 @@
-from django.db import models
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import models, connection
+from django.db.models import Q
+from django.db.models.functions import Greatest
 from django_filters import rest_framework
+from rest_framework import filters
+from rest_framework.settings import api_settings
 import django_filters
 
 from goals.models import Goal, GoalCategory
+from goals.search import full_text_search_enabled
 
 
 class GoalDateFilter(rest_framework.FilterSet):
@@ -26,3 +33,48 @@ class CategoryBoardFilter(rest_framework.FilterSet):
         fields = {
             'board': ('exact',)
         }
+
+
+class GoalFullTextSearchFilter(filters.SearchFilter):
+    """Поиск по Goal.search_vector с ранжированием; без GOAL_FULL_TEXT_SEARCH на PostgreSQL — обычный SearchFilter."""
+
+    def filter_queryset(self, request, queryset, view):
+        if not full_text_search_enabled():
+            return super().filter_queryset(request, queryset, view)
+
+        terms = ' '.join(self.get_search_terms(request))
+        if not terms:
+            return queryset
+
+        query = SearchQuery(terms, config=settings.GOAL_SEARCH_CONFIG, search_type='websearch')
+        queryset = queryset.filter(search_vector=query)
+        if api_settings.ORDERING_PARAM in request.query_params:
+            return queryset
+        return queryset.annotate(rank=SearchRank(models.F('search_vector'), query)).order_by('-rank', 'id')
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """На PostgreSQL находит подстроку или похожее значение (pg_trgm) и сортирует по сходству с запросом."""
+
+    def filter_queryset(self, request, queryset, view):
+        if connection.vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        # Как и в SearchFilter, каждое слово должно найтись хотя бы в одном из полей.
+        for term in search_terms:
+            condition = Q()
+            for field in search_fields:
+                condition |= Q(**{f'{field}__icontains': term}) | Q(**{f'{field}__trigram_similar': term})
+            queryset = queryset.filter(condition)
+        if api_settings.ORDERING_PARAM in request.query_params:
+            return queryset
+
+        query = ' '.join(search_terms)
+        similarities = [TrigramSimilarity(field, query) for field in search_fields]
+        similarity = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        return queryset.annotate(similarity=similarity).order_by('-similarity', 'id')
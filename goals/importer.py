@@ -0,0 +1,149 @@
+import codecs
+import csv
+import json
+from typing import IO, Iterable, Iterator
+
+from django.conf import settings
+from django.db import transaction, DatabaseError
+
+from core.models import User
+from goals import statistics, search
+from goals.models import Board, Goal, GoalCategory
+from goals.response_cache import bump_board_versions
+from goals.serializers import GoalImportRowSerializer
+
+# В отчёт попадают ошибки только первых строк, чтобы ответ на битый файл не разрастался.
+MAX_REPORTED_ERRORS = 100
+
+Row = tuple[int, dict | None]
+# Номер строки, цель без категории и название её категории.
+Pending = tuple[int, Goal, str]
+
+
+def find_undecodable_line(file: IO[bytes]) -> int | None:
+    """
+    Возвращает номер первой строки файла не в UTF-8 или None и перематывает файл в начало.
+
+    Проверяется до импорта: иначе пачки перед битой строкой успели бы сохраниться, а ответом была бы ошибка.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    number: int = 0
+    try:
+        for number, line in enumerate(file, start=1):
+            decoder.decode(line)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return number
+    finally:
+        file.seek(0)
+    return None
+
+
+def parse(lines: Iterable[bytes], file_format: str) -> Iterator[Row]:
+    """Читает файл построчно, не загружая целиком; возвращает (номер строки, данные или None для нечитаемой)."""
+    text: Iterator[str] = codecs.iterdecode(lines, 'utf-8-sig')
+    if file_format == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Пустые ячейки считаются незаполненными полями, лишние колонки отбрасываются.
+            yield reader.line_num, {key: value for key, value in row.items() if key is not None and value != ''}
+        return
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+class GoalImport:
+    """
+    Импортирует цели на одну доску, от имени пользователя с правом записи на ней (проверяется вызывающим).
+
+    Категории ищутся по названию среди неудалённых категорий доски, недостающие создаются вместе с первой
+    сохранённой целью. Цели вставляются через bulk_create пачками по GOAL_IMPORT_BATCH_SIZE, каждая пачка
+    в своей транзакции (внутри внешней — в точке сохранения). Если пачка не сохранилась, её строки
+    повторяются по одной, каждая в своей точке сохранения, и в отчёт попадают только те, что не сохраняются
+    и поодиночке; созданные для них категории откатываются вместе с ними. Ошибочные строки не прерывают
+    импорт, а попадают в отчёт.
+    """
+
+    def __init__(self, user: User, board: Board, batch_size: int | None = None):
+        self.user = user
+        self.board = board
+        self.batch_size: int = batch_size or settings.GOAL_IMPORT_BATCH_SIZE
+        self.categories: dict[str, int] = {}
+        categories = GoalCategory.objects.filter(board=board, is_deleted=False).order_by('id')
+        for category_id, title in categories.values_list('id', 'title'):
+            # При одинаковых названиях берётся самая ранняя категория.
+            self.categories.setdefault(title, category_id)
+        self.created: int = 0
+        self.failed: int = 0
+        self.errors: list[dict] = []
+
+    def run(self, rows: Iterable[Row]) -> dict:
+        batch: list[Pending] = []
+        for number, row in rows:
+            pending = self._build(number, row)
+            if pending is not None:
+                batch.append(pending)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        self._flush(batch)
+        return {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+
+    def _build(self, number: int, row: dict | None) -> Pending | None:
+        if row is None:
+            self._fail(number, {'non_field_errors': ['Строка не является JSON-объектом']})
+            return None
+        serializer = GoalImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            self._fail(number, serializer.errors)
+            return None
+        attrs: dict = dict(serializer.validated_data)
+        title: str = attrs.pop('category')
+        goal = Goal(user=self.user, board_id=self.board.id, **attrs)
+        goal.sync_archived_at()
+        return number, goal, title
+
+    def _flush(self, batch: list[Pending]) -> None:
+        if not batch:
+            return
+        try:
+            self._save(batch)
+        except DatabaseError:
+            for _, goal, _ in batch:
+                # Откат не возвращает состояние объектов: id и ключ статистики от неудачной попытки сбрасываются.
+                goal.pk, goal._statistic_key, goal._state.adding = None, None, True
+            for pending in batch:
+                try:
+                    self._save([pending])
+                except DatabaseError as error:
+                    self._fail(pending[0], {'non_field_errors': [str(error)]})
+
+    def _save(self, batch: list[Pending]) -> None:
+        goals: list[Goal] = [goal for _, goal, _ in batch]
+        new_categories: dict[str, int] = {}
+        with transaction.atomic():
+            for _, goal, title in batch:
+                if title not in self.categories and title not in new_categories:
+                    new_categories[title] = GoalCategory.objects.create(
+                        board=self.board, user=self.user, title=title
+                    ).id
+                goal.category_id = self.categories.get(title) or new_categories[title]
+            Goal.objects.bulk_create(goals)
+            # bulk_create обходит сигналы: статистика, поисковый вектор и версии кеша обновляются явно.
+            statistics.goals_saved(goals)
+            search.update_search_vector(Goal.objects.filter(id__in=[goal.id for goal in goals]))
+            bump_board_versions(self.board.id)
+        # Только после успешной вставки: категории откатившейся пачки в базе не остались.
+        self.categories.update(new_categories)
+        self.created += len(goals)
+
+    def _fail(self, number: int, errors: dict) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': number, 'errors': errors})
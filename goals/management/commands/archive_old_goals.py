@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from goals import cold_storage
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит давно архивированные цели и их комментарии в архивные таблицы порциями; '
+        'прерванный запуск можно повторить.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, help='Сколько дней цель должна пробыть в архиве (GOAL_COLD_STORAGE_AFTER_DAYS)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=500, help='Целей в одной транзакции')
+
+    def handle(self, *args, **options):
+        days: int = options['days'] if options['days'] is not None else settings.GOAL_COLD_STORAGE_AFTER_DAYS
+        cutoff = timezone.now() - timedelta(days=days)
+        total: int = 0
+        while moved := cold_storage.move_chunk(cutoff, options['chunk_size']):
+            total += moved
+            self.stdout.write(f'Moved {moved} goals ({total} so far)')
+        self.stdout.write(self.style.SUCCESS(f'Moved {total} goals archived before {cutoff:%Y-%m-%d %H:%M}'))
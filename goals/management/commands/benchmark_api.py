@@ -0,0 +1,168 @@
+import random
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import Client
+from django.urls import reverse
+
+from core.models import User
+from goals.models import Board, Goal
+
+# Доли вызовов в смеси: списки целей фронтенд запрашивает чаще всего.
+WEIGHTS: dict[str, int] = {
+    'goal_list': 35,
+    'goal_detail': 15,
+    'category_list': 10,
+    'comment_list': 10,
+    'board_list': 10,
+    'board_detail': 5,
+    'goal_statistics': 5,
+    'profile': 10,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет взвешенную смесь GET-запросов к goals/ и core/ от имени сгенерированных пользователей '
+        'и выводит пропускную способность и p50/p95/p99 задержки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--users', type=int, default=10, help='Сколько пользователей с префиксом задействовать')
+        parser.add_argument('--prefix', default='bench', help='Префикс имён пользователей из generate_dataset')
+        parser.add_argument('--password', default='benchmark')
+        parser.add_argument('--base-url', help='Адрес запущенного сервера; без него запросы идут через тестовый клиент')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        users: list[User] = list(
+            User.objects.filter(username__startswith=f'{options["prefix"]}_', participants__isnull=False)
+            .distinct().order_by('id')[:options['users']]
+        )
+        if not users:
+            raise CommandError('Нет пользователей с досками: сначала запустите generate_dataset')
+
+        targets: dict[int, dict[str, list[int]]] = {user.id: self._targets(user) for user in users}
+        plan: list[tuple[User, str, str]] = []
+        for _ in range(options['requests']):
+            user = rng.choice(users)
+            name = rng.choices(list(WEIGHTS), weights=list(WEIGHTS.values()))[0]
+            if name == 'goal_detail' and not targets[user.id]['goal']:
+                name = 'goal_list'
+            plan.append((user, name, self._url(name, targets[user.id], rng)))
+
+        timings: dict[str, list[float]] = defaultdict(list)
+        errors: dict[str, int] = defaultdict(int)
+        chunks = [plan[index::options['concurrency']] for index in range(options['concurrency'])]
+
+        started = time.perf_counter()
+        if options['concurrency'] == 1:
+            batches = [self._run(plan, options)]
+        else:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                batches = list(executor.map(lambda chunk: self._run_in_thread(chunk, options), chunks))
+        wall = time.perf_counter() - started
+
+        for results in batches:
+            for name, elapsed, ok in results:
+                timings[name].append(elapsed)
+                errors[name] += not ok
+
+        self._report(timings, errors, wall)
+
+    @staticmethod
+    def _targets(user: User) -> dict[str, list[int]]:
+        boards = Board.objects.filter(participants__user=user, is_deleted=False)
+        return {
+            'board': list(boards.values_list('id', flat=True)[:50]),
+            'goal': list(
+                Goal.objects.filter(board__in=boards).exclude(status=Goal.Status.archived)
+                .values_list('id', flat=True)[:50]
+            ),
+        }
+
+    @staticmethod
+    def _url(name: str, targets: dict[str, list[int]], rng: random.Random) -> str:
+        if name == 'goal_detail':
+            return reverse('goals:retrieve_update_goal', args=[rng.choice(targets['goal'])])
+        if name == 'board_detail':
+            return reverse('goals:retrieve_update_destroy_board', args=[rng.choice(targets['board'])])
+        if name == 'category_list':
+            return f'{reverse("goals:list_of_categories")}?board={rng.choice(targets["board"])}&limit=20'
+        if name == 'comment_list' and targets['goal']:
+            return f'{reverse("goals:list_of_comments")}?goal={rng.choice(targets["goal"])}&limit=20'
+        return {
+            'goal_list': f'{reverse("goals:list_of_goals")}?limit=20',
+            'comment_list': f'{reverse("goals:list_of_comments")}?limit=20',
+            'board_list': f'{reverse("goals:board_list")}?limit=20',
+            'goal_statistics': reverse('goals:goal_statistics'),
+            'profile': reverse('core:profile-view'),
+        }[name]
+
+    def _run(self, plan: list[tuple[User, str, str]], options: dict) -> list[tuple[str, float, bool]]:
+        get = self._live_getter(options) if options['base_url'] else self._test_client_getter()
+        results: list[tuple[str, float, bool]] = []
+        for user, name, url in plan:
+            started = time.perf_counter()
+            status_code: int = get(user, url)
+            results.append((name, (time.perf_counter() - started) * 1000, status_code == 200))
+        return results
+
+    def _run_in_thread(self, plan: list[tuple[User, str, str]], options: dict) -> list[tuple[str, float, bool]]:
+        """У каждого потока свои клиенты и своё соединение с БД, которое закрывается по завершении."""
+        try:
+            return self._run(plan, options)
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def _test_client_getter():
+        clients: dict[int, Client] = {}
+
+        def get(user: User, url: str) -> int:
+            if user.id not in clients:
+                clients[user.id] = Client()
+                clients[user.id].force_login(user)
+            return clients[user.id].get(url).status_code
+        return get
+
+    @staticmethod
+    def _live_getter(options: dict):
+        sessions: dict[int, requests.Session] = {}
+
+        def get(user: User, url: str) -> int:
+            if user.id not in sessions:
+                sessions[user.id] = requests.Session()
+                sessions[user.id].post(
+                    urljoin(options['base_url'], reverse('core:login-view')),
+                    json={'username': user.username, 'password': options['password']},
+                ).raise_for_status()
+            return sessions[user.id].get(urljoin(options['base_url'], url)).status_code
+        return get
+
+    def _report(self, timings: dict[str, list[float]], errors: dict[str, int], wall: float) -> None:
+        total: int = sum(len(samples) for samples in timings.values())
+        self.stdout.write(f'{"endpoint":<16}{"count":>8}{"errors":>8}{"p50":>10}{"p95":>10}{"p99":>10}')
+        everything: list[float] = []
+        for name in sorted(timings):
+            everything.extend(timings[name])
+            self._row(name, timings[name], errors[name])
+        self._row('total', everything, sum(errors.values()))
+        self.stdout.write(f'Throughput: {total / wall:.1f} req/s over {wall:.2f} s')
+
+    def _row(self, name: str, samples: list[float], error_count: int) -> None:
+        if len(samples) > 1:
+            cuts = statistics.quantiles(samples, n=100, method='inclusive')
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = samples[0]
+        self.stdout.write(f'{name:<16}{len(samples):>8}{error_count:>8}{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+
+from goals.models import Goal, GoalComment, GoalCategory
+
+
+class Command(BaseCommand):
+    help = 'Проверяет денормализованный board_id целей и комментариев и при --fix исправляет расхождения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Исправить найденные расхождения')
+
+    def handle(self, *args, **options):
+        goals = Goal.objects.exclude(board_id=F('category__board_id'))
+        # Комментарии сверяются с доской категории, а не с board_id цели, который сам может быть неверным.
+        comments = GoalComment.objects.exclude(board_id=F('goal__category__board_id'))
+
+        goals_count, comments_count = goals.count(), comments.count()
+        self.stdout.write(f'Goals with wrong board_id: {goals_count}')
+        self.stdout.write(f'Comments with wrong board_id: {comments_count}')
+
+        if options['fix'] and (goals_count or comments_count):
+            with transaction.atomic():
+                goals.update(board_id=Subquery(
+                    GoalCategory.objects.filter(id=OuterRef('category_id')).values('board_id')[:1]
+                ))
+                comments.update(board_id=Subquery(
+                    Goal.objects.filter(id=OuterRef('goal_id')).values('board_id')[:1]
+                ))
+            self.stdout.write(self.style.SUCCESS('Fixed'))
@@ -0,0 +1,57 @@
+import inspect
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.generics import GenericAPIView
+
+from core.models import User
+from goals import views
+from goals.models import BoardParticipant
+
+
+class Command(BaseCommand):
+    help = 'Выводит планы выполнения (EXPLAIN) для get_queryset каждого представления goals.views.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='id пользователя, от имени которого строятся запросы')
+        parser.add_argument('--analyze', action='store_true', help='EXPLAIN ANALYZE (только PostgreSQL)')
+        parser.add_argument('--view', action='append', dest='views', help='Имя представления; можно повторять')
+
+    def handle(self, *args, **options):
+        user: User = self._get_user(options['user'])
+        explain_options: dict = {'analyze': True} if options['analyze'] else {}
+
+        for name, view_class in self._get_views(options['views']):
+            view: GenericAPIView = view_class()
+            request = view.initialize_request(RequestFactory().get('/'))
+            request.user = user
+            view.request, view.args, view.kwargs, view.format_kwarg = request, (), {}, None
+
+            queryset = view.filter_queryset(view.get_queryset())
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
+
+    @staticmethod
+    def _get_user(user_id: int | None) -> User:
+        if user_id is not None:
+            try:
+                return User.objects.get(id=user_id)
+            except User.DoesNotExist:
+                raise CommandError(f'User {user_id} does not exist')
+        if participant := BoardParticipant.objects.select_related('user').first():
+            return participant.user
+        raise CommandError('No board participants found, pass --user explicitly')
+
+    @staticmethod
+    def _get_views(names: list[str] | None) -> list[tuple[str, type[GenericAPIView]]]:
+        found: list[tuple[str, type[GenericAPIView]]] = [
+            (name, cls) for name, cls in inspect.getmembers(views, inspect.isclass)
+            if issubclass(cls, GenericAPIView) and 'get_queryset' in cls.__dict__
+        ]
+        if names:
+            if unknown := set(names) - {name for name, _ in found}:
+                raise CommandError(f'Unknown views: {", ".join(sorted(unknown))}')
+            found = [(name, cls) for name, cls in found if name in names]
+        return found
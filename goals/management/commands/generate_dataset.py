@@ -0,0 +1,136 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import User
+from goals import statistics, search
+from goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+
+STATUS_WEIGHTS = {
+    Goal.Status.to_do: 35, Goal.Status.in_progress: 25, Goal.Status.done: 30, Goal.Status.archived: 10,
+}
+PRIORITY_WEIGHTS = {
+    Goal.Priority.low: 30, Goal.Priority.medium: 40, Goal.Priority.high: 20, Goal.Priority.critical: 10,
+}
+
+
+class Command(BaseCommand):
+    help = 'Генерирует синтетический набор данных bulk-вставками для нагрузочных замеров.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--boards', type=int, default=200)
+        parser.add_argument('--categories', type=int, default=5, help='В среднем категорий на доску')
+        parser.add_argument('--goals', type=int, default=20, help='В среднем целей на категорию')
+        parser.add_argument('--comments', type=int, default=2, help='В среднем комментариев на цель')
+        parser.add_argument('--prefix', default='bench', help='Префикс имён пользователей')
+        parser.add_argument('--password', default='benchmark', help='Пароль всех пользователей')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+
+        with transaction.atomic():
+            users = self._create_users(options['users'], options['prefix'], options['password'])
+            boards = Board.objects.bulk_create(
+                [Board(title=f'Board {index}') for index in range(options['boards'])], batch_size=self.batch_size
+            )
+            members = self._create_participants(boards, users)
+            categories = self._create_categories(boards, members, options['categories'])
+            goals = self._create_goals(categories, members, options['goals'])
+            comments = self._create_comments(goals, members, options['comments'])
+
+            # bulk_create обходит сигналы: статистику и поисковый вектор досчитываем явно.
+            board_ids = [board.id for board in boards]
+            statistics.rebuild(board_ids)
+            search.update_search_vector(Goal.objects.filter(board_id__in=board_ids))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(users)} users, {len(boards)} boards, {len(categories)} categories, '
+            f'{len(goals)} goals, {len(comments)} comments'
+        ))
+
+    def _create_users(self, count: int, prefix: str, password: str) -> list[User]:
+        # Хеш пароля считается один раз: make_password на каждого пользователя занял бы минуты.
+        hashed: str = make_password(password)
+        start: int = User.objects.filter(username__startswith=f'{prefix}_').count()
+        return User.objects.bulk_create(
+            [User(username=f'{prefix}_{start + index}', password=hashed) for index in range(count)],
+            batch_size=self.batch_size,
+        )
+
+    def _create_participants(self, boards: list[Board], users: list[User]) -> dict[int, list[User]]:
+        """Владелец и Парето-распределённое число участников: у большинства досок их мало, у немногих — десятки."""
+        participants: list[BoardParticipant] = []
+        members: dict[int, list[User]] = {}
+        for board in boards:
+            extra: int = min(len(users) - 1, int(self.rng.paretovariate(1.2)) - 1)
+            board_users: list[User] = self.rng.sample(users, extra + 1)
+            members[board.id] = board_users
+            participants.append(BoardParticipant(board=board, user=board_users[0], role=BoardParticipant.Role.owner))
+            participants.extend(
+                BoardParticipant(
+                    board=board,
+                    user=user,
+                    role=self.rng.choice((BoardParticipant.Role.writer, BoardParticipant.Role.reader)),
+                )
+                for user in board_users[1:]
+            )
+        BoardParticipant.objects.bulk_create(participants, batch_size=self.batch_size)
+        return members
+
+    def _create_categories(self, boards: list[Board], members: dict[int, list[User]],
+                           average: int) -> list[GoalCategory]:
+        categories: list[GoalCategory] = [
+            GoalCategory(board=board, user=members[board.id][0], title=f'Category {index}')
+            for board in boards
+            for index in range(self._around(average))
+        ]
+        return GoalCategory.objects.bulk_create(categories, batch_size=self.batch_size)
+
+    def _create_goals(self, categories: list[GoalCategory], members: dict[int, list[User]],
+                      average: int) -> list[Goal]:
+        goals: list[Goal] = []
+        for category in categories:
+            for index in range(self._around(average)):
+                goals.append(Goal(
+                    category=category,
+                    board_id=category.board_id,
+                    user=self.rng.choice(members[category.board_id]),
+                    title=f'Goal {index} in {category.title}',
+                    description=self.rng.choice((None, f'Description of goal {index}')),
+                    status=self._weighted(STATUS_WEIGHTS),
+                    priority=self._weighted(PRIORITY_WEIGHTS),
+                    due_date=self._due_date(),
+                ))
+                goals[-1].sync_archived_at()
+        return Goal.objects.bulk_create(goals, batch_size=self.batch_size)
+
+    def _create_comments(self, goals: list[Goal], members: dict[int, list[User]], average: int) -> list[GoalComment]:
+        comments: list[GoalComment] = [
+            GoalComment(
+                goal=goal, board_id=goal.board_id, user=self.rng.choice(members[goal.board_id]), text=f'Comment {index}'
+            )
+            for goal in goals
+            for index in range(self._around(average))
+        ]
+        return GoalComment.objects.bulk_create(comments, batch_size=self.batch_size)
+
+    def _around(self, average: int) -> int:
+        return self.rng.randint(0, 2 * average) if average else 0
+
+    def _weighted(self, weights: dict[int, int]) -> int:
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _due_date(self):
+        """Пятая часть целей без срока, остальные разбросаны вокруг ближайших двух недель, часть просрочена."""
+        if self.rng.random() < 0.2:
+            return None
+        return self.now + timedelta(days=self.rng.gauss(14, 30))
@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from goals.importer import GoalImport, find_undecodable_line, parse
+from goals.membership import get_board_role, WRITE_ROLES
+from goals.models import Board
+
+
+class Command(BaseCommand):
+    help = 'Импортирует цели из CSV или NDJSON на доску от имени пользователя; ошибочные строки пропускаются.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--board', type=int, required=True)
+        parser.add_argument('--user', required=True, help='Имя пользователя с правом записи на доске')
+        parser.add_argument('--format', dest='file_format', choices=('csv', 'ndjson'), help='По расширению файла')
+        parser.add_argument('--batch-size', type=int, help='Целей в одном bulk_create (GOAL_IMPORT_BATCH_SIZE)')
+
+    def handle(self, *args, **options):
+        try:
+            user: User = User.objects.get(username=options['user'])
+            board: Board = Board.objects.get(id=options['board'], is_deleted=False)
+        except (User.DoesNotExist, Board.DoesNotExist) as error:
+            raise CommandError(error)
+        if get_board_role(user.id, board.id) not in WRITE_ROLES:
+            raise CommandError(f'User {user.username} cannot write to board {board.id}')
+        file_format: str = options['file_format'] or ('csv' if options['path'].lower().endswith('.csv') else 'ndjson')
+
+        with open(options['path'], 'rb') as file:
+            if number := find_undecodable_line(file):
+                raise CommandError(f'Line {number} is not valid UTF-8')
+            report: dict = GoalImport(user, board, options['batch_size']).run(parse(file, file_format))
+
+        for error in report['errors']:
+            self.stderr.write(f'Row {error["row"]}: {json.dumps(error["errors"], ensure_ascii=False)}')
+        self.stdout.write(self.style.SUCCESS(f'Created {report["created"]} goals, {report["failed"]} rows failed'))
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from goals import purge
+
+
+class Command(BaseCommand):
+    help = 'Физически удаляет давно удалённые доски и категории вместе с целями, комментариями и участниками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, help='Сколько дней объект должен пробыть удалённым (PURGE_DELETED_AFTER_DAYS)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=500, help='Строк в одной транзакции')
+        parser.add_argument('--dry-run', action='store_true', help='Только подсчитать, что будет удалено')
+
+    def handle(self, *args, **options):
+        days: int = options['days'] if options['days'] is not None else settings.PURGE_DELETED_AFTER_DAYS
+        report = purge.purge(timezone.now() - timedelta(days=days), options['chunk_size'], options['dry_run'])
+        verb: str = 'Would delete' if options['dry_run'] else 'Deleted'
+        for label, count in sorted(report.items()):
+            self.stdout.write(f'{verb} {count} {label}')
+        self.stdout.write(self.style.SUCCESS(f'{verb} {sum(report.values())} rows'))
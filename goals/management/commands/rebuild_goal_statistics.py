@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from goals import statistics
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статистику целей по таблице целей, устраняя накопившиеся расхождения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', help='Пересчитать только указанные доски')
+
+    def handle(self, *args, **options):
+        cells = statistics.rebuild(options['board'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {cells} statistic rows'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from goals import search
+from goals.models import Goal
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поисковый вектор целей порциями; нужен после включения GOAL_FULL_TEXT_SEARCH.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Целей в одном UPDATE')
+
+    def handle(self, *args, **options):
+        if not search.full_text_search_enabled():
+            raise CommandError('Полнотекстовый поиск выключен: нужны GOAL_FULL_TEXT_SEARCH=True и PostgreSQL')
+        cursor: int = 0
+        total: int = 0
+        while ids := list(
+            Goal.objects.filter(id__gt=cursor).order_by('id').values_list('id', flat=True)[:options['chunk_size']]
+        ):
+            with transaction.atomic():
+                total += search.update_search_vector(Goal.objects.filter(id__in=ids))
+            cursor = ids[-1]
+        self.stdout.write(self.style.SUCCESS(f'Updated search vectors of {total} goals'))
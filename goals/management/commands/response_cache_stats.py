@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from goals import response_cache
+from goals.mixins import ResponseCacheMixin
+from goals import views  # noqa: F401 — регистрирует подклассы ResponseCacheMixin
+
+
+class Command(BaseCommand):
+    help = 'Выводит попадания и промахи кеша ответов по view.'
+
+    def handle(self, *args, **options):
+        view_names = sorted(view.__name__ for view in ResponseCacheMixin.__subclasses__())
+        for view, stats in response_cache.get_stats(view_names).items():
+            total = stats['hit'] + stats['miss']
+            ratio = stats['hit'] / total if total else 0
+            self.stdout.write(f'{view}: hits={stats["hit"]} misses={stats["miss"]} hit_ratio={ratio:.2f}')
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from goals import cascade
+
+
+class Command(BaseCommand):
+    help = 'Воркер фоновой архивации целей удалённых досок и категорий.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Обработать очередь и завершиться')
+        parser.add_argument('--chunk-size', type=int, help='Целей в одной транзакции (CASCADE_CHUNK_SIZE)')
+        parser.add_argument('--poll-interval', type=float, default=5, help='Пауза при пустой очереди, с')
+
+    def handle(self, *args, **options):
+        while True:
+            job = cascade.claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                close_old_connections()
+                time.sleep(options['poll_interval'])
+                continue
+
+            cascade.run_job(job, options['chunk_size'])
+            self.stdout.write(f'Job {job.id} ({job}): {job.get_status_display()}, {job.processed}/{job.total}')
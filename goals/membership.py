@@ -0,0 +1,72 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import request_started, request_finished
+from django.db import transaction
+from django.dispatch import receiver
+
+from goals.models import BoardParticipant
+
+MEMBERSHIP_CACHE_KEY = 'goals:membership:{user_id}'
+WRITE_ROLES = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+
+# Без общего кеша роли читаются из БД один раз за запрос: {user_id: roles} живёт от начала до конца запроса.
+_request_roles: ContextVar[dict[int, dict[int, int]] | None] = ContextVar('request_roles', default=None)
+
+
+@receiver(request_started)
+def _start_request(**kwargs) -> None:
+    _request_roles.set({})
+
+
+@receiver(request_finished)
+def _finish_request(**kwargs) -> None:
+    _request_roles.set(None)
+
+
+def _cache():
+    return caches[settings.MEMBERSHIP_CACHE_ALIAS]
+
+
+def _load_roles(user_id: int) -> dict[int, int]:
+    return dict(BoardParticipant.objects.filter(user_id=user_id).values_list('board_id', 'role'))
+
+
+def get_board_roles(user_id: int) -> dict[int, int]:
+    """
+    Возвращает роли пользователя на досках в виде {board_id: role}.
+
+    С MEMBERSHIP_CACHE_ENABLED роли кешируются в общем кеше между запросами, иначе читаются из БД
+    один раз за запрос.
+    """
+    if not settings.MEMBERSHIP_CACHE_ENABLED:
+        memo: dict[int, dict[int, int]] | None = _request_roles.get()
+        if memo is None:
+            return _load_roles(user_id)
+        if user_id not in memo:
+            memo[user_id] = _load_roles(user_id)
+        return memo[user_id]
+
+    key: str = MEMBERSHIP_CACHE_KEY.format(user_id=user_id)
+    roles: dict[int, int] | None = _cache().get(key)
+    if roles is None:
+        roles = _load_roles(user_id)
+        _cache().set(key, roles, settings.MEMBERSHIP_CACHE_TIMEOUT)
+    return roles
+
+
+def get_board_role(user_id: int, board_id: int) -> int | None:
+    return get_board_roles(user_id).get(board_id)
+
+
+def invalidate_board_roles(*user_ids: int) -> None:
+    """Сбрасывает кеш ролей сразу и повторно после коммита, чтобы параллельный запрос не закешировал старые роли."""
+    if memo := _request_roles.get():
+        for user_id in user_ids:
+            memo.pop(user_id, None)
+    if not settings.MEMBERSHIP_CACHE_ENABLED:
+        return
+    keys: list[str] = [MEMBERSHIP_CACHE_KEY.format(user_id=user_id) for user_id in user_ids]
+    _cache().delete_many(keys)
+    transaction.on_commit(lambda: _cache().delete_many(keys))
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def backfill_board(apps, schema_editor):
+    Goal = apps.get_model('goals', 'Goal')
+    GoalCategory = apps.get_model('goals', 'GoalCategory')
+    GoalComment = apps.get_model('goals', 'GoalComment')
+
+    Goal.objects.update(
+        board_id=Subquery(GoalCategory.objects.filter(id=OuterRef('category_id')).values('board_id')[:1])
+    )
+    GoalComment.objects.update(
+        board_id=Subquery(Goal.objects.filter(id=OuterRef('goal_id')).values('board_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='goals', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AddField(
+            model_name='goalcomment',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='comments', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.RunPython(backfill_board, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='goal',
+            name='board',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='goals', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AlterField(
+            model_name='goalcomment',
+            name='board',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='comments', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['board', 'due_date', '-priority'], name='goal_active_board_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcomment',
+            index=models.Index(fields=['board', '-created'], name='comment_board_created_idx'),
+        ),
+    ]
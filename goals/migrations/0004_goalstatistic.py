@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_statistics(apps, schema_editor):
+    Goal = apps.get_model('goals', 'Goal')
+    GoalStatistic = apps.get_model('goals', 'GoalStatistic')
+
+    GoalStatistic.objects.bulk_create([
+        GoalStatistic(
+            category_id=row['category_id'], board_id=row['board_id'],
+            status=row['status'], priority=row['priority'], count=row['n'],
+        )
+        for row in Goal.objects.values('category_id', 'board_id', 'status', 'priority').annotate(n=Count('id'))
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0003_goal_board_goalcomment_board'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')], verbose_name='Статус')),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Низкий'), (2, 'Средний'), (3, 'Высокий'), (4, 'Критический')], verbose_name='Приоритет')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='goals.board', verbose_name='Доска')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='goals.goalcategory', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Статистика целей',
+                'verbose_name_plural': 'Статистика целей',
+                'unique_together': {('category', 'status', 'priority')},
+            },
+        ),
+        migrations.RunPython(fill_statistics, migrations.RunPython.noop),
+    ]
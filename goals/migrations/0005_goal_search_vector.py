@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+import django.contrib.postgres.search
+
+
+def create_search_index(apps, schema_editor):
+    # GIN-индекс есть только в PostgreSQL, поэтому он создаётся здесь, а не в Goal.Meta.indexes.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Goal = apps.get_model('goals', 'Goal')
+    Goal.objects.update(search_vector=(
+        SearchVector('title', weight='A', config=settings.GOAL_SEARCH_CONFIG) +
+        SearchVector(Coalesce('description', Value('')), weight='B', config=settings.GOAL_SEARCH_CONFIG)
+    ))
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS goal_search_vector_idx ON goals_goal USING gin (search_vector)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS goal_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0004_goalstatistic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
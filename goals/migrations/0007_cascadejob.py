@@ -0,0 +1,40 @@
+# Generated by Django 4.1.13 on 2026-10-18 11:22
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0006_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CascadeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')),
+                ('kind', models.CharField(choices=[('board', 'Доска'), ('category', 'Категория')], max_length=16, verbose_name='Тип')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Доска или категория')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'В очереди'), (2, 'Выполняется'), (3, 'Завершена'), (4, 'Ошибка')], default=1, verbose_name='Статус')),
+                ('cursor', models.BigIntegerField(default=0, verbose_name='Курсор')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Целей к архивации')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Заархивировано')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Последняя ошибка')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Не раньше')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Взята в работу')),
+            ],
+            options={
+                'verbose_name': 'Каскадная задача',
+                'verbose_name_plural': 'Каскадные задачи',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cascadejob',
+            index=models.Index(fields=['status', 'run_after'], name='cascade_job_queue_idx'),
+        ),
+    ]
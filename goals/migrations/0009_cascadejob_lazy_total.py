@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0008_cold_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cascadejob',
+            name='total',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Целей к архивации'),
+        ),
+    ]
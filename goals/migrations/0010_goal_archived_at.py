@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_archived_at(apps, schema_editor):
+    # Настоящий момент архивации уже архивных целей неизвестен (updated меняется и после неё), поэтому отсчёт
+    # срока хранения для них начинается с применения миграции: раньше срока в архивные таблицы ничего не уйдёт.
+    Goal = apps.get_model('goals', 'Goal')
+    Goal.objects.filter(status=4).update(archived_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0009_cascadejob_lazy_total'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата архивации'),
+        ),
+        migrations.RunPython(backfill_archived_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4)), fields=['archived_at'], name='goal_archived_at_idx'),
+        ),
+    ]
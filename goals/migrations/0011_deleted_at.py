@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_deleted_at(apps, schema_editor):
+    # Настоящий момент удаления неизвестен (updated меняется и после него), поэтому срок хранения уже удалённых
+    # досок и категорий отсчитывается от применения миграции: раньше срока ничего не будет удалено физически.
+    now = timezone.now()
+    for model_name in ('Board', 'GoalCategory'):
+        apps.get_model('goals', model_name).objects.filter(is_deleted=True).update(deleted_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0010_goal_archived_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата удаления'),
+        ),
+        migrations.AddField(
+            model_name='goalcategory',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата удаления'),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+    ]
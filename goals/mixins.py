@@ -0,0 +1,105 @@
+import hashlib
+from datetime import datetime
+from functools import reduce
+
+from django.conf import settings
+from django.db.models import Count, Max, Model, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from goals import response_cache
+from goals.membership import get_board_roles
+
+
+class ConditionalGetMixin:
+    """
+    ETag для list и retrieve, Last-Modified только для retrieve: на совпавший валидатор отдаётся 304
+    без сериализации. Спискам Last-Modified не ставится: удаление строки или потеря видимости не сдвигают
+    max(updated), и по If-Modified-Since клиент получил бы 304 с исчезнувшими строками.
+
+    Валидатор строится из max(updated) и числа строк видимого набора, ролей пользователя на досках
+    (смена участников меняет видимость) и полного пути запроса с фильтрами и пагинацией. Вложенные
+    в ответ объекты, которые меняются отдельно от основной строки (автор), перечисляются в nested_updated:
+    их updated тоже входит в валидатор.
+    """
+    nested_updated: tuple[str, ...] = ()
+
+    def get_list_state(self, queryset: QuerySet) -> tuple[datetime | None, tuple]:
+        state = queryset.aggregate(
+            last_modified=Max('updated'),
+            count=Count('id'),
+            **{f'nested_{index}': Max(lookup) for index, lookup in enumerate(self.nested_updated)},
+        )
+        count = state.pop('count')
+        return _latest(*state.values()), (count,)
+
+    def get_object_state(self, instance: Model) -> tuple[datetime | None, tuple]:
+        nested = (reduce(getattr, lookup.split('__'), instance) for lookup in self.nested_updated)
+        return _latest(instance.updated, *nested), ()
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        last_modified, state = self.get_list_state(self.filter_queryset(self.get_queryset()))
+        etag = self._etag(last_modified, state)
+        response = self._not_modified(request, etag, None) or super().list(request, *args, **kwargs)
+        return self._with_validators(response, etag, None)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        instance = self.get_object()
+        last_modified, state = self.get_object_state(instance)
+        etag = self._etag(last_modified, state)
+        response = self._not_modified(request, etag, last_modified) or Response(self.get_serializer(instance).data)
+        return self._with_validators(response, etag, last_modified)
+
+    def _etag(self, last_modified: datetime | None, state: tuple) -> str:
+        roles = sorted(get_board_roles(self.request.user.id).items())
+        key = repr((self.request.user.id, roles, self.request.get_full_path(), last_modified, state))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, last_modified: datetime | None):
+        return get_conditional_response(
+            request, etag=etag, last_modified=last_modified and int(last_modified.timestamp())
+        )
+
+    @staticmethod
+    def _with_validators(response, etag: str, last_modified: datetime | None):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # Клиент обязан перепроверять ответ: он зависит от прав пользователя, которые могут смениться.
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def _latest(*moments: datetime | None) -> datetime | None:
+    return max(filter(None, moments), default=None)
+
+
+class ResponseCacheMixin:
+    """
+    Кеширует данные ответа list по пользователю, view и query-параметрам (RESPONSE_CACHE_ENABLED).
+
+    Записи не удаляются: в ключ входят версии видимых досок, которые меняют сигналы из goals.signals.
+    """
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return super().list(request, *args, **kwargs)
+
+        view: str = type(self).__name__
+        key: str = response_cache.response_key(view, request)
+        data = response_cache.get_response(key)
+        if data is not None:
+            response_cache.record(view, 'hit')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response_cache.record(view, 'miss')
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            response_cache.set_response(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
@@ -1,4 +1,7 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 
 from core.models import User
 
@@ -14,6 +17,8 @@ class BaseModel(models.Model):
 class Board(BaseModel):
     title = models.CharField(max_length=255, verbose_name='Доска')
     is_deleted = models.BooleanField(default=False, verbose_name='Удалена')
+    # Момент пометки удалённой: от него purge_deleted_boards отсчитывает срок до физического удаления.
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='Дата удаления')
 
     class Meta:
         verbose_name = 'Доска'
@@ -27,17 +32,32 @@ class GoalCategory(BaseModel):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(fields=('board', 'title'), condition=Q(is_deleted=False), name='category_active_board_idx'),
+        ]
 
     user = models.ForeignKey(User, on_delete=models.PROTECT, verbose_name='Автор', related_name='category')
     title = models.CharField(max_length=255, verbose_name='Название')
     is_deleted = models.BooleanField(default=False, verbose_name='Удалена')
+    # Момент пометки удалённой: от него purge_deleted_boards отсчитывает срок до физического удаления.
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='Дата удаления')
     board = models.ForeignKey(
         Board, on_delete=models.PROTECT, related_name='category', verbose_name='Доска'
     )
 
+    # Доска на момент загрузки: по ней goals.signals сбрасывает кеш ответов прежней доски при переносе.
+    _loaded_board_id: int | None = None
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'board_id' in field_names:
+            instance._loaded_board_id = instance.board_id
+        return instance
+
 
 class Goal(BaseModel):
     class Status(models.IntegerChoices):
@@ -55,6 +75,21 @@ class Goal(BaseModel):
     class Meta:
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
+        # status=4 — Goal.Status.archived: из Meta нельзя сослаться на вложенный класс Status.
+        indexes = [
+            models.Index(
+                fields=('category', 'due_date', '-priority'),
+                condition=~Q(status=4),
+                name='goal_active_category_due_idx',
+            ),
+            models.Index(fields=('user',), condition=~Q(status=4), name='goal_active_user_idx'),
+            models.Index(
+                fields=('board', 'due_date', '-priority'),
+                condition=~Q(status=4),
+                name='goal_active_board_due_idx',
+            ),
+            models.Index(fields=('archived_at',), condition=Q(status=4), name='goal_archived_at_idx'),
+        ]
 
     user = models.ForeignKey(User, on_delete=models.PROTECT, verbose_name='Автор', related_name='goals')
     category = models.ForeignKey(GoalCategory, on_delete=models.CASCADE, verbose_name='Категория', related_name='goals')
@@ -64,29 +99,89 @@ class Goal(BaseModel):
     priority = models.PositiveSmallIntegerField(choices=Priority.choices, default=Priority.medium,
                                                 verbose_name='Приоритет')
     due_date = models.DateTimeField(null=True, blank=True, verbose_name='Дата дедлайна')
+    # Денормализованная доска категории: фильтр видимости обходится без join через категорию.
+    board = models.ForeignKey(
+        Board, on_delete=models.PROTECT, related_name='goals', verbose_name='Доска', editable=False
+    )
+    # Заполняется goals.search только на PostgreSQL; GIN-индекс создаёт миграция 0005.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Момент перевода в «Архив»: по нему archive_old_goals отбирает цели для переноса в архивные таблицы.
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='Дата архивации')
+
+    # Значения (category_id, board_id, status, priority) на момент загрузки: по ним goals.statistics
+    # считает, из какой ячейки статистики цель ушла при сохранении.
+    _statistic_key: tuple[int, int, int, int] | None = None
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'category_id', 'board_id', 'status', 'priority'} <= set(field_names):
+            instance._statistic_key = instance.statistic_key
+        return instance
+
+    @property
+    def statistic_key(self) -> tuple[int, int, int, int]:
+        return self.category_id, self.board_id, self.status, self.priority
+
+    def sync_archived_at(self) -> None:
+        """Отмечает момент архивации по статусу; перед bulk_create/bulk_update вызывается явно."""
+        if self.status == self.Status.archived:
+            self.archived_at = self.archived_at or timezone.now()
+        else:
+            self.archived_at = None
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'category' in update_fields:
+            self.board_id = self.category.board_id
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields = {*update_fields, 'board'}
+        self.sync_archived_at()
+        if update_fields is not None and 'status' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'archived_at'}
+        super().save(*args, **kwargs)
+
 
 class GoalComment(BaseModel):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=('goal', '-created'), name='comment_goal_created_idx'),
+            models.Index(fields=('board', '-created'), name='comment_board_created_idx'),
+        ]
 
     goal = models.ForeignKey(Goal, on_delete=models.CASCADE, verbose_name='Цель', related_name='comments')
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name='Автор', related_name='comments')
     text = models.TextField(verbose_name='Текст комментария')
+    # Денормализованная доска цели, поддерживается при сохранении и сигналами из goals.signals.
+    board = models.ForeignKey(
+        Board, on_delete=models.PROTECT, related_name='comments', verbose_name='Доска', editable=False
+    )
 
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'goal' in update_fields:
+            self.board_id = self.goal.board_id
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+        super().save(*args, **kwargs)
+
 
 class BoardParticipant(BaseModel):
     class Meta:
         verbose_name = 'Участник'
         verbose_name_plural = 'Участники'
         unique_together = ('board', 'user')
+        indexes = [
+            models.Index(fields=('user', 'board', 'role'), name='participant_user_board_idx'),
+        ]
 
     class Role(models.IntegerChoices):
         owner = 1, 'Владелец'
@@ -110,3 +205,99 @@ class BoardParticipant(BaseModel):
     role = models.PositiveSmallIntegerField(
         choices=Role.choices, default=Role.owner, verbose_name='Роль'
     )
+
+
+class GoalStatistic(models.Model):
+    """Количество целей категории с данными статусом и приоритетом; поддерживается инкрементально."""
+
+    class Meta:
+        verbose_name = 'Статистика целей'
+        verbose_name_plural = 'Статистика целей'
+        unique_together = ('category', 'status', 'priority')
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='statistics', verbose_name='Доска')
+    category = models.ForeignKey(
+        GoalCategory, on_delete=models.CASCADE, related_name='statistics', verbose_name='Категория'
+    )
+    status = models.PositiveSmallIntegerField(choices=Goal.Status.choices, verbose_name='Статус')
+    priority = models.PositiveSmallIntegerField(choices=Goal.Priority.choices, verbose_name='Приоритет')
+    count = models.IntegerField(default=0, verbose_name='Количество')
+
+
+class CascadeJob(BaseModel):
+    """Фоновая архивация целей удалённой доски или категории; goals.cascade обрабатывает её порциями."""
+
+    class Kind(models.TextChoices):
+        board = 'board', 'Доска'
+        category = 'category', 'Категория'
+
+    class Status(models.IntegerChoices):
+        pending = 1, 'В очереди'
+        running = 2, 'Выполняется'
+        done = 3, 'Завершена'
+        failed = 4, 'Ошибка'
+
+    class Meta:
+        verbose_name = 'Каскадная задача'
+        verbose_name_plural = 'Каскадные задачи'
+        indexes = [
+            models.Index(fields=('status', 'run_after'), name='cascade_job_queue_idx'),
+        ]
+
+    kind = models.CharField(max_length=16, choices=Kind.choices, verbose_name='Тип')
+    object_id = models.PositiveIntegerField(verbose_name='Доска или категория')
+    status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.pending, verbose_name='Статус')
+    # Id последней обработанной цели: порции идут по возрастанию id, повторный запуск продолжает с него.
+    cursor = models.BigIntegerField(default=0, verbose_name='Курсор')
+    # Считается воркером при первом взятии задачи, а не в транзакции удаления.
+    total = models.PositiveIntegerField(null=True, blank=True, verbose_name='Целей к архивации')
+    processed = models.PositiveIntegerField(default=0, verbose_name='Заархивировано')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')
+    last_error = models.TextField(blank=True, default='', verbose_name='Последняя ошибка')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='Не раньше')
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name='Взята в работу')
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}'
+
+
+class ArchivedGoal(models.Model):
+    """Архивная цель, перенесённая из goals_goal командой archive_old_goals; id сохраняется."""
+
+    class Meta:
+        verbose_name = 'Архивная цель'
+        verbose_name_plural = 'Архивные цели'
+        indexes = [
+            models.Index(fields=('board', '-archived_at'), name='archived_goal_board_idx'),
+        ]
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.PROTECT, verbose_name='Автор', related_name='+')
+    category = models.ForeignKey(GoalCategory, on_delete=models.CASCADE, verbose_name='Категория', related_name='+')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, verbose_name='Доска', related_name='+')
+    title = models.CharField(max_length=255, verbose_name='Название')
+    description = models.TextField(null=True, blank=True, verbose_name='Описание')
+    priority = models.PositiveSmallIntegerField(choices=Goal.Priority.choices, verbose_name='Приоритет')
+    due_date = models.DateTimeField(null=True, blank=True, verbose_name='Дата дедлайна')
+    created = models.DateTimeField(verbose_name='Дата создания')
+    updated = models.DateTimeField(verbose_name='Дата последнего обновления')
+    archived_at = models.DateTimeField(default=timezone.now, verbose_name='Перенесена в архив')
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedGoalComment(models.Model):
+    class Meta:
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+
+    id = models.BigIntegerField(primary_key=True)
+    goal = models.ForeignKey(ArchivedGoal, on_delete=models.CASCADE, verbose_name='Цель', related_name='comments')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name='Автор', related_name='+')
+    text = models.TextField(verbose_name='Текст комментария')
+    created = models.DateTimeField(verbose_name='Дата создания')
+    updated = models.DateTimeField(verbose_name='Дата последнего обновления')
+
+    def __str__(self):
+        return self.text
@@ -0,0 +1,106 @@
+import base64
+import binascii
+import json
+
+from django.db.models import F, Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class GoalCursorPagination(LimitOffsetPagination):
+    """Пагинация списка целей.
+
+    По умолчанию работает как limit/offset. При передаче параметра `cursor` (в т.ч. пустого для первой
+    страницы) переключается на keyset-пагинацию по (due_date, priority, id): без COUNT(*) и OFFSET,
+    цели без дедлайна всегда идут в конце списка. Другие сортировки (в т.ч. по рангу полнотекстового
+    поиска) курсор закодировать не может, поэтому на них отвечает 400, а не подменяет их своей.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    cursor_orderings: tuple[str, ...] = ('due_date', '-due_date')
+    invalid_ordering_message = 'Курсор поддерживает только сортировку due_date или -due_date'
+    default_cursor_limit = 20
+    max_cursor_limit = 100
+
+    cursor_mode: bool = False
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list | None:
+        if self.cursor_query_param not in request.query_params:
+            self.cursor_mode = False
+            return super().paginate_queryset(queryset, request, view)
+
+        self.cursor_mode = True
+        self.request = request
+        self.limit = self.get_cursor_limit(request)
+
+        descending: bool = self.get_cursor_descending(queryset, request)
+        due_date = F('due_date').desc(nulls_last=True) if descending else F('due_date').asc(nulls_last=True)
+        queryset = queryset.order_by(due_date, '-priority', 'id')
+
+        if position := self.decode_cursor(request):
+            queryset = queryset.filter(self._after_position(*position, descending=descending))
+
+        page: list = list(queryset[:self.limit + 1])
+        self.has_next = len(page) > self.limit
+        self.page = page[:self.limit]
+        return self.page
+
+    def get_paginated_response(self, data) -> Response:
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_cursor_link(),
+            'results': data,
+        })
+
+    def get_cursor_descending(self, queryset: QuerySet, request) -> bool:
+        # OrderingFilter молча отбрасывает неизвестные поля, поэтому параметр проверяется сам по себе.
+        ordering: str | None = request.query_params.get(api_settings.ORDERING_PARAM)
+        leading: str | None = next(iter(queryset.query.order_by), None)
+        if ordering not in (None, *self.cursor_orderings) or leading not in (None, *self.cursor_orderings):
+            raise ValidationError({api_settings.ORDERING_PARAM: [self.invalid_ordering_message]})
+        return leading == '-due_date'
+
+    def get_cursor_limit(self, request) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_cursor_limit
+        return min(max(limit, 1), self.max_cursor_limit)
+
+    def get_next_cursor_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        position = [last.due_date.isoformat() if last.due_date else None, last.priority, last.id]
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request) -> tuple | None:
+        encoded: str = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None
+        try:
+            due_date, priority, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if due_date is not None:
+                due_date = parse_datetime(due_date)
+                if due_date is None:
+                    raise ValueError
+            return due_date, int(priority), int(pk)
+        except (binascii.Error, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _after_position(due_date, priority: int, pk: int, descending: bool) -> Q:
+        """Условие «строго после» позиции курсора для сортировки (due_date NULLS LAST, -priority, id)."""
+        tie = Q(priority__lt=priority) | Q(priority=priority, id__gt=pk)
+        if due_date is None:
+            return Q(due_date__isnull=True) & tie
+        further = Q(due_date__lt=due_date) if descending else Q(due_date__gt=due_date)
+        return further | Q(due_date__isnull=True) | (Q(due_date=due_date) & tie)
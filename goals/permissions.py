@@ -1,5 +1,6 @@
 from rest_framework import permissions
 
+from goals.membership import get_board_role, WRITE_ROLES
 from goals.models import BoardParticipant, Board, GoalCategory, Goal
 
 
@@ -12,23 +13,23 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
 
 class BoardPermissions(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj: Board):
-        _filters: dict = {'user': request.user, 'board': obj}
+        role: int | None = get_board_role(request.user.id, obj.id)
         if request.method not in permissions.SAFE_METHODS:
-            _filters['role'] = BoardParticipant.Role.owner
-        return BoardParticipant.objects.filter(**_filters).exists()
+            return role == BoardParticipant.Role.owner
+        return role is not None
 
 
 class CategoryPermissions(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj: GoalCategory):
-        _filters: dict = {'user': request.user, 'board': obj.board}
+        role: int | None = get_board_role(request.user.id, obj.board_id)
         if request.method not in permissions.SAFE_METHODS:
-            _filters['role__in'] = [BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        return BoardParticipant.objects.filter(**_filters).exists()
+            return role in WRITE_ROLES
+        return role is not None
 
 
 class GoalBoardPermissions(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj: Goal):
-        _filters: dict = {'user': request.user, 'board': obj.category.board}
+        role: int | None = get_board_role(request.user.id, obj.board_id)
         if request.method not in permissions.SAFE_METHODS:
-            _filters['role__in'] = [BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        return BoardParticipant.objects.filter(**_filters).exists()
+            return role in WRITE_ROLES
+        return role is not None
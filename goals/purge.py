@@ -0,0 +1,86 @@
+from collections import Counter
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from goals.models import ArchivedGoal, ArchivedGoalComment, Board, BoardParticipant, CascadeJob, Goal, \
+    GoalCategory, GoalComment, GoalStatistic
+
+
+def purge(cutoff: datetime, chunk_size: int, dry_run: bool = False) -> Counter[str]:
+    """
+    Физически удаляет доски и категории, помеченные удалёнными раньше cutoff, вместе с зависимыми строками.
+
+    Строки удаляются порциями по chunk_size, каждая в своей транзакции, в порядке, которого требуют
+    внешние ключи PROTECT: комментарии, цели, статистика, категории, участники, доски. Объекты, чья фоновая
+    архивация ещё не завершилась, пропускаются. Возвращает {app_label.Model: число строк}; при dry_run
+    только подсчитывает.
+    """
+    report: Counter[str] = Counter()
+    board_ids: list[int] = list(
+        Board.objects.filter(is_deleted=True, deleted_at__lt=cutoff)
+        .exclude(id__in=_unfinished_jobs(CascadeJob.Kind.board)).values_list('id', flat=True)
+    )
+    category_ids: list[int] = list(
+        GoalCategory.objects.filter(Q(is_deleted=True, deleted_at__lt=cutoff) | Q(board_id__in=board_ids))
+        .exclude(id__in=_unfinished_jobs(CascadeJob.Kind.category))
+        .exclude(board_id__in=_unfinished_jobs(CascadeJob.Kind.board))
+        .values_list('id', flat=True)
+    )
+    # Доска удаляется, только если на ней не останется категорий, иначе её держит PROTECT.
+    board_ids = list(
+        Board.objects.filter(id__in=board_ids)
+        .exclude(id__in=GoalCategory.objects.exclude(id__in=category_ids).values('board_id'))
+        .values_list('id', flat=True)
+    )
+
+    for offset in range(0, len(category_ids), chunk_size):
+        ids: list[int] = category_ids[offset:offset + chunk_size]
+        for queryset in (
+            GoalComment.objects.filter(goal__category_id__in=ids),
+            Goal.objects.filter(category_id__in=ids),
+            ArchivedGoalComment.objects.filter(goal__category_id__in=ids),
+            ArchivedGoal.objects.filter(category_id__in=ids),
+            GoalStatistic.objects.filter(category_id__in=ids),
+            CascadeJob.objects.filter(kind=CascadeJob.Kind.category, object_id__in=ids),
+        ):
+            report[queryset.model._meta.label] += _delete(queryset, chunk_size, dry_run)
+        report[GoalCategory._meta.label] += _delete_with_signals(GoalCategory.objects.filter(id__in=ids), dry_run)
+
+    for offset in range(0, len(board_ids), chunk_size):
+        ids = board_ids[offset:offset + chunk_size]
+        report[CascadeJob._meta.label] += _delete(
+            CascadeJob.objects.filter(kind=CascadeJob.Kind.board, object_id__in=ids), chunk_size, dry_run
+        )
+        # Через delete(): сигналы участников сбрасывают кеш ролей, сигналы досок — версии кеша ответов.
+        report[BoardParticipant._meta.label] += _delete_with_signals(
+            BoardParticipant.objects.filter(board_id__in=ids), dry_run
+        )
+        report[Board._meta.label] += _delete_with_signals(Board.objects.filter(id__in=ids), dry_run)
+    return +report
+
+
+def _unfinished_jobs(kind: str) -> QuerySet:
+    return CascadeJob.objects.filter(kind=kind).exclude(status=CascadeJob.Status.done).values('object_id')
+
+
+def _delete(queryset: QuerySet, chunk_size: int, dry_run: bool) -> int:
+    """Удаляет строки порциями без загрузки объектов и без сигналов: их последствия уходят вместе с доской."""
+    if dry_run:
+        return queryset.count()
+    deleted: int = 0
+    while ids := list(queryset.values_list('id', flat=True)[:chunk_size]):
+        with transaction.atomic():
+            chunk: QuerySet = queryset.model.objects.filter(id__in=ids)
+            chunk._raw_delete(chunk.db)
+        deleted += len(ids)
+    return deleted
+
+
+def _delete_with_signals(queryset: QuerySet, dry_run: bool) -> int:
+    if dry_run:
+        return queryset.count()
+    with transaction.atomic():
+        _, counts = queryset.delete()
+    return counts.get(queryset.model._meta.label, 0)
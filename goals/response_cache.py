@@ -0,0 +1,78 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.request import Request
+
+from goals.membership import get_board_roles
+
+BOARD_VERSION_KEY = 'goals:board_version:{board_id}'
+RESPONSE_KEY = 'goals:response:{view}:{user_id}:{digest}'
+STATS_KEY = 'goals:response_cache_stats:{view}:{outcome}'
+
+
+def _cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def bump_board_versions(*board_ids: int) -> None:
+    """
+    Меняет версии досок, делая устаревшими все закешированные ответы, в которые они входят.
+
+    Вместо счётчика пишется случайный токен: если ключ версии вытеснят из кеша, новое значение
+    не совпадёт ни с одним прежним. Повтор после коммита не даёт параллельному запросу
+    закешировать незакоммиченное состояние под новой версией.
+    """
+    keys: list[str] = [BOARD_VERSION_KEY.format(board_id=board_id) for board_id in set(board_ids) if board_id]
+    if not keys:
+        return
+    _cache().set_many({key: uuid4().hex for key in keys}, timeout=None)
+    transaction.on_commit(lambda: _cache().set_many({key: uuid4().hex for key in keys}, timeout=None))
+
+
+def get_board_versions(board_ids) -> list[str]:
+    keys: list[str] = [BOARD_VERSION_KEY.format(board_id=board_id) for board_id in sorted(board_ids)]
+    versions: dict[str, str] = _cache().get_many(keys)
+    missing: dict[str, str] = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        _cache().set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def response_key(view: str, request: Request) -> str:
+    """Ключ ответа: пользователь, view, нормализованные query-параметры, роли и версии видимых досок."""
+    roles: dict[int, int] = get_board_roles(request.user.id)
+    params = sorted((name, request.query_params.getlist(name)) for name in request.query_params)
+    state = repr((params, sorted(roles.items()), get_board_versions(roles)))
+    digest: str = hashlib.md5(state.encode()).hexdigest()
+    return RESPONSE_KEY.format(view=view, user_id=request.user.id, digest=digest)
+
+
+def get_response(key: str):
+    return _cache().get(key)
+
+
+def set_response(key: str, data) -> None:
+    _cache().set(key, data, settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def record(view: str, outcome: str) -> None:
+    key: str = STATS_KEY.format(view=view, outcome=outcome)
+    try:
+        _cache().incr(key)
+    except ValueError:
+        _cache().add(key, 1, timeout=None)
+
+
+def get_stats(views) -> dict[str, dict[str, int]]:
+    keys = {
+        (view, outcome): STATS_KEY.format(view=view, outcome=outcome) for view in views for outcome in ('hit', 'miss')
+    }
+    values: dict[str, int] = _cache().get_many(keys.values())
+    stats: dict[str, dict[str, int]] = {view: {'hit': 0, 'miss': 0} for view in views}
+    for (view, outcome), key in keys.items():
+        stats[view][outcome] = values.get(key, 0)
+    return stats
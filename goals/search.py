@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+from django.db.models import QuerySet, Value
+from django.db.models.functions import Coalesce
+
+# Поля, при изменении которых пересчитывается Goal.search_vector.
+SEARCH_FIELDS = ('title', 'description')
+
+
+def full_text_search_enabled() -> bool:
+    return settings.GOAL_FULL_TEXT_SEARCH and connection.vendor == 'postgresql'
+
+
+def goal_search_vector() -> SearchVector:
+    """Заголовок весит больше описания: совпадения в нём поднимаются выше при ранжировании."""
+    config = settings.GOAL_SEARCH_CONFIG
+    return (
+        SearchVector('title', weight='A', config=config) +
+        SearchVector(Coalesce('description', Value('')), weight='B', config=config)
+    )
+
+
+def update_search_vector(goals: QuerySet) -> int:
+    """
+    Пересчитывает search_vector одним UPDATE; вызывать после массовых изменений title/description.
+
+    При выключенном GOAL_FULL_TEXT_SEARCH вектор не поддерживается, чтобы сохранение цели не стоило лишнего
+    UPDATE; после включения его досчитывает manage.py rebuild_search_vectors.
+    """
+    if not full_text_search_enabled():
+        return 0
+    return goals.update(search_vector=goal_search_vector())
@@ -1,16 +1,20 @@
+from django.conf import settings
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
 from core.models import User
 from core.serializers import ProfileSerializer
-from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant
+from goals.membership import get_board_role, invalidate_board_roles, WRITE_ROLES
+from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant, ArchivedGoal, \
+    ArchivedGoalComment
 
 
 class BoardListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Board
-        fields = '__all__'
+        exclude = ('deleted_at',)
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -18,7 +22,7 @@ class BoardCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        fields = '__all__'
+        exclude = ('deleted_at',)
         read_only_fields = ('id', 'created', 'updated', 'is_deleted')
 
     def create(self, validated_data: dict) -> Board:
@@ -49,21 +53,13 @@ class BoardSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        fields = '__all__'
+        exclude = ('deleted_at',)
         read_only_fields = ('id', 'created', 'updated', 'is_deleted')
 
     def update(self, instance: Board, validated_data: dict) -> Board:
-        """Удаляет из списка всех участников, кроме владельца и записывает заново."""
+        """Синхронизирует участников доски (кроме владельца) и обновляет название."""
         with transaction.atomic():
-            BoardParticipant.objects.filter(board=instance).exclude(user=self.context['request'].user).delete()
-            BoardParticipant.objects.bulk_create([
-                BoardParticipant(
-                    user=participant['user'],
-                    role=participant['role'],
-                    board=instance,
-                )
-                for participant in validated_data.pop('participants', [])
-            ])
+            self.participants_diff = self._sync_participants(instance, validated_data.pop('participants', []))
 
             if title := validated_data.get('title'):
                 instance.title = title
@@ -71,23 +67,61 @@ class BoardSerializer(serializers.ModelSerializer):
 
         return instance
 
+    def _sync_participants(self, instance: Board, participants: list[dict]) -> dict[str, list[int]]:
+        """Применяет к доске только разницу между текущим и переданным списком участников.
+
+        Возвращает id пользователей, которые были добавлены, удалены и у которых сменилась роль.
+        """
+        existing: dict[int, BoardParticipant] = {
+            participant.user_id: participant
+            for participant in BoardParticipant.objects.filter(board=instance).exclude(
+                user=self.context['request'].user
+            ).only('id', 'user_id', 'role')
+        }
+        desired: dict[int, int] = {participant['user'].id: participant['role'] for participant in participants}
+
+        removed: list[int] = [user_id for user_id in existing if user_id not in desired]
+        added: list[BoardParticipant] = [
+            BoardParticipant(user_id=user_id, role=role, board=instance)
+            for user_id, role in desired.items() if user_id not in existing
+        ]
+        changed: list[BoardParticipant] = []
+        now = timezone.now()
+        for user_id, role in desired.items():
+            if (participant := existing.get(user_id)) and participant.role != role:
+                participant.role = role
+                participant.updated = now
+                changed.append(participant)
+
+        if removed:
+            BoardParticipant.objects.filter(board=instance, user_id__in=removed).delete()
+        if changed:
+            BoardParticipant.objects.bulk_update(changed, fields=('role', 'updated'))
+        if added:
+            BoardParticipant.objects.bulk_create(added)
+
+        diff: dict[str, list[int]] = {
+            'added': [participant.user_id for participant in added],
+            'removed': removed,
+            'changed': [participant.user_id for participant in changed],
+        }
+        # bulk_create и bulk_update не отправляют post_save, поэтому кеш ролей сбрасывается явно.
+        invalidate_board_roles(*diff['added'], *diff['removed'], *diff['changed'])
+        return diff
+
 
 class GoalCategoryCreateSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
     class Meta:
         model = GoalCategory
-        fields = '__all__'
+        exclude = ('deleted_at',)
         read_only_fields = ('id', 'user', 'created', 'updated', 'is_deleted')
 
     def validate_board(self, value: Board) -> Board:
         if value.is_deleted:
             raise ValidationError('Нельзя создать категорию в удаленной доске.')
-        if not BoardParticipant.objects.filter(
-                board=value,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-                user_id=self.context['request'].user.id
-        ):
+        if get_board_role(self.context['request'].user.id, value.id) not in WRITE_ROLES:
             raise PermissionDenied
         return value
 
@@ -97,7 +131,7 @@ class GoalCategorySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = GoalCategory
-        fields = '__all__'
+        exclude = ('deleted_at',)
         read_only_fields = ['id', 'user', 'created', 'updated', 'board']
 
 
@@ -106,18 +140,14 @@ class GoalCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Goal
-        fields = '__all__'
+        exclude = ('board', 'search_vector', 'archived_at')
         read_only_fields = ('id', 'user', 'created', 'updated')
 
     def validate_category(self, value: GoalCategory) -> GoalCategory:
         if value.is_deleted:
             raise ValidationError(message='Нельзя создать цель в удаленной категории')
 
-        if not BoardParticipant.objects.filter(
-                board=value.board.id,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-                user_id=self.context['request'].user.id
-        ):
+        if get_board_role(self.context['request'].user.id, value.board_id) not in WRITE_ROLES:
             raise PermissionDenied
         return value
 
@@ -127,7 +157,7 @@ class GoalSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Goal
-        fields = '__all__'
+        exclude = ('board', 'search_vector', 'archived_at')
         read_only_fields = ('id', 'user', 'created', 'updated')
 
 
@@ -136,7 +166,7 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = GoalComment
-        fields = '__all__'
+        exclude = ('board',)
         read_only_fields = ('id', 'user', 'created', 'updated')
 
     def validate_goal(self, value: Goal) -> Goal:
@@ -144,11 +174,7 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
             raise ValidationError('Нельзя оставить комментарий к удаленной цели.')
         if value.category.board.is_deleted:
             raise ValidationError('Нельзя оставить комментарий к цели в удаленной доске.')
-        if not BoardParticipant.objects.filter(
-                board=value.category.board.id,
-                user_id=self.context['request'].user.id,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ):
+        if get_board_role(self.context['request'].user.id, value.board_id) not in WRITE_ROLES:
             raise PermissionDenied
         return value
 
@@ -158,5 +184,83 @@ class GoalCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = GoalComment
-        fields = '__all__'
+        exclude = ('board',)
         read_only_fields = ('id', 'created', 'updated', 'user', 'goal')
+
+
+class GoalBatchDataSerializer(serializers.ModelSerializer):
+    # Категория проверяется в goals.batch одним запросом на всю пачку, а не запросом на каждую цель.
+    category = serializers.IntegerField()
+
+    class Meta:
+        model = Goal
+        fields = ('category', 'title', 'description', 'status', 'priority', 'due_date')
+
+
+class GoalBatchOperationSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=('create', 'update', 'archive'))
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs['action'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError({'id': 'Обязательное поле для update и archive'})
+        if attrs['action'] != 'archive' and 'data' not in attrs:
+            raise serializers.ValidationError({'data': 'Обязательное поле для create и update'})
+        return attrs
+
+
+class GoalBatchSerializer(serializers.Serializer):
+    operations = serializers.ListField(
+        child=GoalBatchOperationSerializer(), allow_empty=False, max_length=settings.GOAL_BATCH_MAX_SIZE
+    )
+
+
+class GoalImportRowSerializer(serializers.ModelSerializer):
+    # Категория указывается названием: goals.importer находит её на доске импорта или создаёт.
+    category = serializers.CharField(max_length=255)
+
+    class Meta:
+        model = Goal
+        fields = ('category', 'title', 'description', 'status', 'priority', 'due_date')
+
+
+class GoalImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.all())
+    file_format = serializers.ChoiceField(choices=('csv', 'ndjson'), required=False)
+
+    def validate_board(self, value: Board) -> Board:
+        if value.is_deleted:
+            raise ValidationError('Нельзя импортировать цели в удаленную доску.')
+        if get_board_role(self.context['request'].user.id, value.id) not in WRITE_ROLES:
+            raise PermissionDenied
+        return value
+
+    def validate(self, attrs: dict) -> dict:
+        if 'file_format' not in attrs:
+            extension: str = attrs['file'].name.rsplit('.', 1)[-1].lower()
+            if extension not in ('csv', 'ndjson', 'jsonl'):
+                raise serializers.ValidationError({'file_format': 'Укажите формат: csv или ndjson'})
+            attrs['file_format'] = 'csv' if extension == 'csv' else 'ndjson'
+        return attrs
+
+
+class ArchivedGoalCommentSerializer(serializers.ModelSerializer):
+    user = ProfileSerializer(read_only=True)
+
+    class Meta:
+        model = ArchivedGoalComment
+        exclude = ('goal',)
+
+
+class ArchivedGoalSerializer(serializers.ModelSerializer):
+    user = ProfileSerializer(read_only=True)
+
+    class Meta:
+        model = ArchivedGoal
+        fields = '__all__'
+
+
+class ArchivedGoalDetailSerializer(ArchivedGoalSerializer):
+    comments = ArchivedGoalCommentSerializer(many=True, read_only=True)
@@ -0,0 +1,90 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from core.models import User
+from core.serializers import ProfileSerializer
+from goals import statistics, search
+from goals.membership import invalidate_board_roles
+from goals.models import BoardParticipant, GoalCategory, Goal, GoalComment, GoalStatistic, Board
+from goals.response_cache import bump_board_versions
+
+
+@receiver([post_save, post_delete], sender=BoardParticipant)
+def invalidate_participant_roles(sender, instance: BoardParticipant, **kwargs) -> None:
+    invalidate_board_roles(instance.user_id)
+
+
+@receiver(post_save, sender=GoalCategory)
+def sync_category_board(sender, instance: GoalCategory, created: bool, update_fields=None, **kwargs) -> None:
+    """Переносит денормализованный board_id целей и комментариев вслед за категорией."""
+    if created or (update_fields is not None and not {'board', 'board_id'} & set(update_fields)):
+        return
+    if instance._loaded_board_id != instance.board_id:
+        # Новая доска сбрасывается общим bump_board_version, прежнюю нужно сбросить здесь.
+        bump_board_versions(instance._loaded_board_id)
+        instance._loaded_board_id = instance.board_id
+    Goal.objects.filter(category=instance).exclude(board_id=instance.board_id).update(board_id=instance.board_id)
+    GoalComment.objects.filter(goal__category=instance).exclude(board_id=instance.board_id).update(
+        board_id=instance.board_id
+    )
+    GoalStatistic.objects.filter(category=instance).exclude(board_id=instance.board_id).update(
+        board_id=instance.board_id
+    )
+
+
+@receiver(post_save, sender=Goal)
+def sync_goal_board(sender, instance: Goal, created: bool, update_fields=None, **kwargs) -> None:
+    """Переносит денормализованный board_id комментариев при смене категории цели."""
+    # У экземпляра с отложенными полями save() сам передаёт update_fields из attname ('board_id').
+    if created or (update_fields is not None and not {'board', 'board_id'} & set(update_fields)):
+        return
+    GoalComment.objects.filter(goal=instance).exclude(board_id=instance.board_id).update(board_id=instance.board_id)
+
+
+@receiver(post_save, sender=Goal)
+def update_goal_statistics(sender, instance: Goal, **kwargs) -> None:
+    statistics.goal_saved(instance)
+
+
+@receiver(post_delete, sender=Goal)
+def update_goal_statistics_on_delete(sender, instance: Goal, **kwargs) -> None:
+    statistics.goal_deleted(instance)
+
+
+@receiver(post_save, sender=Goal)
+def update_goal_search_vector(sender, instance: Goal, update_fields=None, **kwargs) -> None:
+    if update_fields is None or set(update_fields) & set(search.SEARCH_FIELDS):
+        search.update_search_vector(Goal.objects.filter(pk=instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Goal)
+@receiver([post_save, post_delete], sender=GoalCategory)
+@receiver([post_save, post_delete], sender=GoalComment)
+@receiver([post_save, post_delete], sender=BoardParticipant)
+def bump_board_version(sender, instance, **kwargs) -> None:
+    bump_board_versions(instance.board_id)
+
+
+@receiver([post_save, post_delete], sender=Board)
+def bump_own_board_version(sender, instance: Board, **kwargs) -> None:
+    bump_board_versions(instance.id)
+
+
+@receiver(post_save, sender=User)
+def bump_user_board_versions(sender, instance: User, created: bool, update_fields=None, **kwargs) -> None:
+    """Имя автора вложено в ответы goals: его смена сбрасывает кеш досок, где пользователь участник или автор."""
+    if created or (update_fields is not None and not set(update_fields) & set(ProfileSerializer.Meta.fields)):
+        return
+    boards = BoardParticipant.objects.filter(user=instance).values_list('board_id').union(
+        GoalCategory.objects.filter(user=instance).values_list('board_id'),
+        Goal.objects.filter(user=instance).values_list('board_id'),
+        GoalComment.objects.filter(user=instance).values_list('board_id'),
+    )
+    bump_board_versions(*(board_id for board_id, in boards))
+
+
+@receiver(pre_save, sender=Goal)
+def bump_previous_board_version(sender, instance: Goal, **kwargs) -> None:
+    """Цель, перенесённая на другую доску, должна пропасть и из закешированных ответов прежней доски."""
+    if instance._statistic_key and instance._statistic_key[1] != instance.board_id:
+        bump_board_versions(instance._statistic_key[1])
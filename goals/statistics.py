@@ -0,0 +1,105 @@
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from django.db import transaction, IntegrityError
+from django.db.models import F, Count, QuerySet
+from django.utils import timezone
+
+from goals.models import Goal, GoalStatistic
+
+StatisticKey = tuple[int, int, int, int]
+
+
+def apply_deltas(deltas: Counter[StatisticKey]) -> None:
+    """Прибавляет к ячейкам статистики (category_id, board_id, status, priority) переданные приращения."""
+    for (category_id, board_id, status, priority), delta in deltas.items():
+        if not delta:
+            continue
+        cell = GoalStatistic.objects.filter(category_id=category_id, status=status, priority=priority)
+        if cell.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                GoalStatistic.objects.create(
+                    category_id=category_id, board_id=board_id, status=status, priority=priority, count=delta
+                )
+        except IntegrityError:
+            # Ячейку успел создать параллельный запрос.
+            cell.update(count=F('count') + delta)
+
+
+def goals_saved(goals: Iterable[Goal]) -> None:
+    """Переносит сохранённые цели в статистике; для bulk_create/bulk_update вызывается явно."""
+    deltas: Counter[StatisticKey] = Counter()
+    for goal in goals:
+        old_key, new_key = goal._statistic_key, goal.statistic_key
+        if old_key != new_key:
+            deltas[new_key] += 1
+            if old_key:
+                deltas[old_key] -= 1
+        goal._statistic_key = new_key
+    apply_deltas(deltas)
+
+
+def goal_saved(goal: Goal) -> None:
+    goals_saved([goal])
+
+
+def goal_deleted(goal: Goal) -> None:
+    apply_deltas(Counter({goal._statistic_key or goal.statistic_key: -1}))
+
+
+def archive_goals(goals: QuerySet) -> int:
+    """Переводит цели в архив одним UPDATE и переносит их в статистике в статус «Архив»."""
+    goals = goals.exclude(status=Goal.Status.archived)
+    deltas: Counter[StatisticKey] = Counter()
+    with transaction.atomic():
+        for row in goals.values('category_id', 'board_id', 'status', 'priority').annotate(n=Count('id')):
+            deltas[(row['category_id'], row['board_id'], row['status'], row['priority'])] -= row['n']
+            deltas[(row['category_id'], row['board_id'], Goal.Status.archived, row['priority'])] += row['n']
+        now = timezone.now()
+        archived: int = goals.update(status=Goal.Status.archived, archived_at=now, updated=now)
+        apply_deltas(deltas)
+    return archived
+
+
+def rebuild(board_ids: list[int] | None = None) -> int:
+    """Пересчитывает статистику по таблице целей; возвращает число ячеек."""
+    goals = Goal.objects.all()
+    statistics = GoalStatistic.objects.all()
+    if board_ids is not None:
+        goals, statistics = goals.filter(board_id__in=board_ids), statistics.filter(board_id__in=board_ids)
+    with transaction.atomic():
+        statistics.delete()
+        cells: list[GoalStatistic] = GoalStatistic.objects.bulk_create([
+            GoalStatistic(
+                category_id=row['category_id'], board_id=row['board_id'],
+                status=row['status'], priority=row['priority'], count=row['n'],
+            )
+            for row in goals.values('category_id', 'board_id', 'status', 'priority').annotate(n=Count('id'))
+        ])
+    return len(cells)
+
+
+def summary(board_ids) -> list[dict]:
+    """Сводка по доскам и категориям: всего целей и разбивка по статусам и приоритетам."""
+    boards: dict[int, dict] = {}
+    categories: dict[int, dict] = {}
+    cells = GoalStatistic.objects.filter(
+        board_id__in=board_ids, board__is_deleted=False, category__is_deleted=False, count__gt=0
+    ).order_by('board_id', 'category_id').values_list('board_id', 'category_id', 'status', 'priority', 'count')
+
+    def empty(**ids) -> dict:
+        return {**ids, 'total': 0, 'by_status': defaultdict(int), 'by_priority': defaultdict(int)}
+
+    for board_id, category_id, status, priority, count in cells:
+        if board_id not in boards:
+            boards[board_id] = {**empty(board=board_id), 'categories': []}
+        if category_id not in categories:
+            categories[category_id] = empty(category=category_id)
+            boards[board_id]['categories'].append(categories[category_id])
+        for node in (boards[board_id], categories[category_id]):
+            node['total'] += count
+            node['by_status'][status] += count
+            node['by_priority'][priority] += count
+    return list(boards.values())
@@ -9,6 +9,12 @@ urlpatterns = [
 
     path('goal/create', views.GoalCreateView.as_view(), name='create_goal'),
     path('goal/list', views.GoalListView.as_view(), name='list_of_goals'),
+    path('goal/batch', views.GoalBatchView.as_view(), name='goal_batch'),
+    path('goal/import', views.GoalImportView.as_view(), name='goal_import'),
+    path('goal/statistics', views.GoalStatisticsView.as_view(), name='goal_statistics'),
+    path('goal/archive/list', views.ArchivedGoalListView.as_view(), name='list_of_archived_goals'),
+    path('goal/archive/<pk>', views.ArchivedGoalView.as_view(), name='retrieve_archived_goal'),
+    path('goal/archive/<pk>/restore', views.ArchivedGoalRestoreView.as_view(), name='restore_archived_goal'),
     path('goal/<pk>', views.GoalView.as_view(), name='retrieve_update_goal'),
 
     path('goal_comment/create', views.GoalCommentCreateView.as_view(), name='create_comment'),
@@ -19,4 +25,6 @@ urlpatterns = [
     path('board/list', views.BoardListView.as_view(), name='board_list'),
     path('board/<pk>', views.BoardView.as_view(), name='retrieve_update_destroy_board'),
 
+    path('export/<file_format>', views.ExportView.as_view(), name='export'),
+
 ]
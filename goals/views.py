@@ -1,17 +1,43 @@
+from datetime import datetime
+
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Q, Max, Count, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework import filters, generics
+from rest_framework.exceptions import PermissionDenied, ValidationError, NotFound
+from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView, RetrieveAPIView
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
-
-from goals.filters import GoalDateFilter, CategoryBoardFilter
-from goals.models import GoalCategory, Goal, GoalComment, Board
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import User
+from core.serializers import ProfileSerializer
+from goals import statistics, cascade, cold_storage, export
+from goals.batch import GoalBatch
+from goals.importer import GoalImport, find_undecodable_line, parse
+from goals.filters import GoalDateFilter, CategoryBoardFilter, GoalFullTextSearchFilter, \
+    TrigramSearchFilter
+from goals.membership import get_board_roles, WRITE_ROLES
+from goals.mixins import ConditionalGetMixin, ResponseCacheMixin
+from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant, CascadeJob, ArchivedGoal, \
+    ArchivedGoalComment
+from goals.pagination import GoalCursorPagination
 from goals.permissions import CategoryPermissions, GoalBoardPermissions, IsOwnerOrReadOnly, BoardPermissions
+from goals.response_cache import bump_board_versions
 from goals.serializers import GoalCategoryCreateSerializer, GoalCategorySerializer, GoalCreateSerializer, \
     GoalSerializer, GoalCommentCreateSerializer, GoalCommentSerializer, BoardCreateSerializer, BoardListSerializer, \
-    BoardSerializer
+    BoardSerializer, GoalBatchSerializer, ArchivedGoalSerializer, ArchivedGoalDetailSerializer, GoalImportSerializer
+
+# Колонки автора, которых нет в ProfileSerializer (пароль, аватар и т. п.), не читаются из БД;
+# updated нужен валидатору ConditionalGetMixin.
+UNRENDERED_PROFILE_FIELDS: tuple[str, ...] = tuple(
+    f'user__{field.name}' for field in User._meta.concrete_fields
+    if field.name not in ProfileSerializer.Meta.fields and field.name != 'updated'
+)
 
 
 class GoalCategoryCreateView(CreateAPIView):
@@ -20,39 +46,42 @@ class GoalCategoryCreateView(CreateAPIView):
     serializer_class = GoalCategoryCreateSerializer
 
 
-class GoalCategoryListView(ListAPIView):
+class GoalCategoryListView(ConditionalGetMixin, ResponseCacheMixin, ListAPIView):
     model = GoalCategory
     serializer_class = GoalCategorySerializer
+    nested_updated = ('user__updated',)
     permission_classes = [CategoryPermissions, ]
     pagination_class = LimitOffsetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, TrigramSearchFilter]
     filterset_class = CategoryBoardFilter
     search_fields = ['title']
     ordering_fields = ['title', 'created']
     ordering = ['title']
 
     def get_queryset(self):
-        return GoalCategory.objects.prefetch_related('board__participants').filter(
-            board__participants__user_id=self.request.user.id,
+        return GoalCategory.objects.select_related('user').defer(*UNRENDERED_PROFILE_FIELDS).filter(
+            board_id__in=get_board_roles(self.request.user.id),
             is_deleted=False
         )
 
 
-class GoalCategoryView(RetrieveUpdateDestroyAPIView):
+class GoalCategoryView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     model = GoalCategory
     serializer_class = GoalCategorySerializer
+    nested_updated = ('user__updated',)
     permission_classes = [CategoryPermissions]
 
     def get_queryset(self):
-        return GoalCategory.objects.select_related('user').filter(
+        return GoalCategory.objects.select_related('user').defer(*UNRENDERED_PROFILE_FIELDS).filter(
             is_deleted=False,
         )
 
     def perform_destroy(self, instance):
         with transaction.atomic():
-            instance.is_deleted = True
-            instance.save(update_fields=('is_deleted',))
-            instance.goals.update(status=Goal.Status.archived)
+            instance.is_deleted, instance.deleted_at = True, timezone.now()
+            instance.save(update_fields=('is_deleted', 'deleted_at', 'updated'))
+            # Цели скрыты фильтром category__is_deleted сразу, архивирует их воркер run_cascade_jobs.
+            cascade.enqueue(CascadeJob.Kind.category, instance.id)
         return instance
 
 
@@ -62,71 +91,103 @@ class GoalCreateView(CreateAPIView):
     serializer_class = GoalCreateSerializer
 
 
-class GoalListView(ListAPIView):
+class GoalListView(ConditionalGetMixin, ResponseCacheMixin, ListAPIView):
     model = Goal
     permission_classes = [IsAuthenticated]
     serializer_class = GoalSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    nested_updated = ('user__updated',)
+    pagination_class = GoalCursorPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, GoalFullTextSearchFilter]
     filterset_class = GoalDateFilter
     search_fields = ['title', 'description']
     ordering_fields = ['due_date']
     ordering = ['due_date', '-priority']
 
     def get_queryset(self):
-        return Goal.objects.select_related('category').filter(
+        return Goal.objects.select_related('user').defer('search_vector', *UNRENDERED_PROFILE_FIELDS).filter(
             ~Q(status=Goal.Status.archived) &
             Q(category__is_deleted=False) &
-            Q(category__board__participants__user_id=self.request.user.id)
+            Q(board_id__in=get_board_roles(self.request.user.id))
         )
 
 
-class GoalView(RetrieveUpdateDestroyAPIView):
+class GoalView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     model = Goal
     permission_classes = [IsAuthenticated, GoalBoardPermissions]
     serializer_class = GoalSerializer
+    nested_updated = ('user__updated',)
 
     def get_queryset(self):
-        return Goal.objects.select_related('category').filter(
+        return Goal.objects.select_related('user').defer('search_vector', *UNRENDERED_PROFILE_FIELDS).filter(
             ~Q(status=Goal.Status.archived) &
             Q(category__is_deleted=False) &
-            Q(category__board__participants__user_id=self.request.user.id)
+            Q(board_id__in=get_board_roles(self.request.user.id))
         )
 
     def perform_destroy(self, instance):
         with transaction.atomic():
             instance.status = Goal.Status.archived
-            instance.save(update_fields=('status',))
+            # save() сам добавит archived_at в update_fields: по нему archive_old_goals отбирает цели для переноса.
+            instance.save(update_fields=('status', 'updated'))
         return instance
 
 
+class GoalBatchView(APIView):
+    """Пачка операций над целями: {"operations": [{"action": "create|update|archive", "id": ..., "data": {...}}]}."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        serializer = GoalBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({'results': GoalBatch(request.user, serializer.validated_data['operations']).run()})
+
+
+class GoalImportView(APIView):
+    """Импорт целей из файла: multipart с полями file, board и необязательным file_format (csv или ndjson)."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        serializer = GoalImportSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        file = serializer.validated_data['file']
+        if number := find_undecodable_line(file):
+            raise ValidationError({'file': [f'Строка {number} не в кодировке UTF-8']})
+        rows = parse(file, serializer.validated_data['file_format'])
+        return Response(GoalImport(request.user, serializer.validated_data['board']).run(rows))
+
+
 class GoalCommentCreateView(CreateAPIView):
     model = GoalComment
     serializer_class = GoalCommentCreateSerializer
     permission_classes = [IsAuthenticated]
 
 
-class GoalCommentListView(ListAPIView):
+class GoalCommentListView(ConditionalGetMixin, ResponseCacheMixin, ListAPIView):
     model = GoalComment
     permission_classes = [IsAuthenticated]
     serializer_class = GoalCommentSerializer
+    nested_updated = ('user__updated',)
     pagination_class = LimitOffsetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
     ordering = ['-created']
 
     def get_queryset(self):
-        return GoalComment.objects.filter(
-            goal__category__board__participants__user_id=self.request.user.id
+        return GoalComment.objects.select_related('user').defer(*UNRENDERED_PROFILE_FIELDS).filter(
+            board_id__in=get_board_roles(self.request.user.id)
         )
 
 
-class GoalCommentView(RetrieveUpdateDestroyAPIView):
+class GoalCommentView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     model = GoalComment
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     serializer_class = GoalCommentSerializer
+    nested_updated = ('user__updated',)
 
     def get_queryset(self):
-        return GoalComment.objects.filter(goal__category__board__participants__user_id=self.request.user.id)
+        return GoalComment.objects.select_related('user').defer(*UNRENDERED_PROFILE_FIELDS).filter(
+            board_id__in=get_board_roles(self.request.user.id)
+        )
 
 
 class BoardCreateView(CreateAPIView):
@@ -134,33 +195,132 @@ class BoardCreateView(CreateAPIView):
     permission_classes = [IsAuthenticated, ]
 
 
-class BoardListView(ListAPIView):
+class BoardListView(ConditionalGetMixin, ResponseCacheMixin, ListAPIView):
     model = Board
     serializer_class = BoardListSerializer
     permission_classes = [BoardPermissions, ]
     pagination_class = LimitOffsetPagination
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [filters.OrderingFilter, TrigramSearchFilter]
+    search_fields = ['title']
     ordering = ['title']
 
     def get_queryset(self):
-        return Board.objects.prefetch_related('participants').filter(
-            participants__user_id=self.request.user.id,
+        return Board.objects.filter(
+            id__in=get_board_roles(self.request.user.id),
             is_deleted=False
         )
 
 
-class BoardView(RetrieveUpdateDestroyAPIView):
+class BoardView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     model = Board
     serializer_class = BoardSerializer
     permission_classes = [BoardPermissions, ]
 
     def get_queryset(self):
-        return Board.objects.filter(is_deleted=False)
+        return Board.objects.prefetch_related(Prefetch(
+            'participants',
+            queryset=BoardParticipant.objects.select_related('user').only(
+                'id', 'created', 'updated', 'role', 'board', 'user__username'
+            ),
+        )).filter(is_deleted=False)
+
+    def get_object_state(self, instance: Board) -> tuple[datetime | None, tuple]:
+        # В ответ входят участники доски и их имена: их изменения тоже должны менять валидатор.
+        participants = instance.participants.aggregate(
+            last_modified=Max('updated'), users_modified=Max('user__updated'), count=Count('id')
+        )
+        moments = (instance.updated, participants['last_modified'], participants['users_modified'])
+        return max(filter(None, moments)), (participants['count'],)
 
     def perform_destroy(self, instance):
         with transaction.atomic():
-            instance.is_deleted = True
-            instance.save(update_fields=('is_deleted',))
-            instance.category.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(status=Goal.Status.archived)
+            instance.is_deleted, instance.deleted_at = True, timezone.now()
+            instance.save(update_fields=('is_deleted', 'deleted_at', 'updated'))
+            # Уже удалённые категории сохраняют свой момент удаления.
+            instance.category.filter(is_deleted=False).update(
+                is_deleted=True, deleted_at=instance.deleted_at, updated=instance.deleted_at
+            )
+            cascade.enqueue(CascadeJob.Kind.board, instance.id)
+            bump_board_versions(instance.id)
         return instance
+
+
+class GoalStatisticsView(APIView):
+    """Сводка по целям на досках пользователя; ?board=<id> ограничивает одной доской."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        board_ids = set(get_board_roles(request.user.id))
+        board = request.query_params.get('board')
+        if board is not None:
+            board_ids &= {int(board)} if board.isdigit() else set()
+        return Response(statistics.summary(board_ids))
+
+
+class ArchivedGoalListView(ListAPIView):
+    """Цели, перенесённые командой archive_old_goals в архивные таблицы; только чтение."""
+    model = ArchivedGoal
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArchivedGoalSerializer
+    pagination_class = LimitOffsetPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    filterset_fields = ['board', 'category']
+    search_fields = ['title', 'description']
+    ordering_fields = ['archived_at', 'created', 'due_date']
+    ordering = ['-archived_at']
+
+    def get_queryset(self):
+        return ArchivedGoal.objects.select_related('user').defer(*UNRENDERED_PROFILE_FIELDS).filter(
+            board_id__in=get_board_roles(self.request.user.id)
+        )
+
+
+class ArchivedGoalView(RetrieveAPIView):
+    model = ArchivedGoal
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArchivedGoalDetailSerializer
+
+    def get_queryset(self):
+        return ArchivedGoal.objects.select_related('user').defer(*UNRENDERED_PROFILE_FIELDS).prefetch_related(
+            Prefetch(
+                'comments',
+                queryset=ArchivedGoalComment.objects.select_related('user').defer(*UNRENDERED_PROFILE_FIELDS)
+                .order_by('created'),
+            )
+        ).filter(board_id__in=get_board_roles(self.request.user.id))
+
+
+class ArchivedGoalRestoreView(generics.GenericAPIView):
+    """Возвращает цель из архивных таблиц в рабочие; нужна роль владельца или редактора доски."""
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ArchivedGoal.objects.select_related('category__board').filter(
+            board_id__in=get_board_roles(self.request.user.id)
+        )
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        archived: ArchivedGoal = self.get_object()
+        if get_board_roles(request.user.id).get(archived.board_id) not in WRITE_ROLES:
+            raise PermissionDenied
+        if archived.category.is_deleted or archived.category.board.is_deleted:
+            raise ValidationError('Нельзя восстановить цель в удаленную категорию или доску.')
+        goal: Goal = cold_storage.restore(archived)
+        return Response(GoalSerializer(goal).data)
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка всего, что пользователь видит на своих досках: export/ndjson или export/csv, ?gzip=1."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request, file_format: str) -> StreamingHttpResponse:
+        if file_format not in export.CONTENT_TYPES:
+            raise NotFound
+        compress: bool = request.query_params.get('gzip') in ('1', 'true')
+        filename: str = f'export.{file_format}.gz' if compress else f'export.{file_format}'
+        response = StreamingHttpResponse(
+            export.stream(request.user.id, file_format, compress),
+            content_type='application/gzip' if compress else f'{export.CONTENT_TYPES[file_format]}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,50 @@
+import pytest
+
+from bot.tg.sender import MessageQueue, TokenBucket, split_text, MAX_MESSAGE_LENGTH
+from tests.bot.utils import FakeClient
+
+
+@pytest.mark.django_db
+class TestMessageQueue:
+    def test_pending_messages_to_one_chat_are_coalesced(self):
+        client = FakeClient()
+        queue = MessageQueue(client)
+        for text in ('first', 'second', 'third'):
+            queue.send_message(chat_id=1, text=text)
+        queue.send_message(chat_id=2, text='other')
+
+        queue.start().stop(timeout=5)
+
+        assert sorted(client.sent) == [(1, 'first\n\nsecond\n\nthird'), (2, 'other')]
+
+    def test_long_text_is_split(self):
+        client = FakeClient()
+        queue = MessageQueue(client, chat_burst=10)
+        text = '\n'.join(['x' * 100] * 100)
+        queue.send_message(chat_id=1, text=text)
+
+        queue.start().stop(timeout=5)
+
+        assert len(client.sent) == 3
+        assert all(len(sent) <= MAX_MESSAGE_LENGTH for _, sent in client.sent)
+        assert '\n'.join(sent for _, sent in client.sent) == text
+
+    def test_split_text_without_newlines(self):
+        head, rest = split_text('x' * (MAX_MESSAGE_LENGTH + 10))
+
+        assert len(head) == MAX_MESSAGE_LENGTH
+        assert rest == 'x' * 10
+
+    def test_token_bucket(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=1, capacity=2, clock=lambda: now[0])
+        bucket.consume()
+        bucket.consume()
+
+        assert bucket.delay() == 1
+
+        now[0] = 0.5
+        assert bucket.delay() == 0.5
+
+        now[0] = 1
+        assert bucket.delay() == 0
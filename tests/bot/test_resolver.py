@@ -0,0 +1,38 @@
+import pytest
+
+from bot.models import TgUser
+from bot.resolver import resolve_tg_users, get_or_create_tg_user
+from tests.bot.utils import make_message
+
+
+@pytest.mark.django_db
+class TestTgUserResolver:
+    @pytest.fixture
+    def tg_users(self, user) -> list[TgUser]:
+        return [
+            TgUser.objects.create(telegram_chat_id=str(chat_id), telegram_user_id=str(chat_id), user=user)
+            for chat_id in (1, 2)
+        ]
+
+    def test_batch_is_resolved_in_one_query(self, tg_users, django_assert_num_queries):
+        messages = [make_message(1, 'a'), make_message(2, 'b'), make_message(1, 'c'), make_message(3, 'd')]
+
+        with django_assert_num_queries(1):
+            resolved = resolve_tg_users(messages)
+
+        assert resolved == {1: tg_users[0], 2: tg_users[1]}
+
+    def test_cached_user_is_refreshed_on_save(self, tg_users, another_user, monkeypatch,
+                                              django_assert_num_queries):
+        monkeypatch.setattr('todolist.settings.BOT_TG_USER_CACHE_TTL', 60)
+        get_or_create_tg_user(make_message(1, 'a'))
+
+        tg_user = TgUser.objects.get(telegram_chat_id='1')
+        tg_user.user = another_user
+        tg_user.save()
+
+        with django_assert_num_queries(0):
+            cached, created = get_or_create_tg_user(make_message(1, 'a'))
+
+        assert not created
+        assert cached.user_id == another_user.id
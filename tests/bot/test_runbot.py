@@ -0,0 +1,31 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bot.management.commands.runbot import Command
+from tests.bot.utils import make_message
+
+
+@pytest.mark.django_db
+class TestAsyncDispatch:
+    def test_prefetched_tg_user_is_used_only_while_chat_is_idle(self, monkeypatch):
+        monkeypatch.setattr('todolist.settings.BOT_CHAT_IDLE_TIMEOUT', 0.05)
+        command = Command()
+        processed: list[tuple[str, str | None]] = []
+        monkeypatch.setattr(
+            command, 'process_message', lambda message, tg_user=None: processed.append((message.text, tg_user))
+        )
+
+        async def run() -> None:
+            command._executor = ThreadPoolExecutor(max_workers=1)
+            command._queues, command._workers, command._pending = {}, {}, {}
+            command.dispatch(make_message(1, 'a'), 'first')
+            command.dispatch(make_message(1, 'b'), 'stale')
+            command.dispatch(make_message(2, 'c'), 'other')
+            await asyncio.gather(*command._workers.values())
+
+        asyncio.run(run())
+
+        assert sorted(processed) == [('a', 'first'), ('b', None), ('c', 'other')]
+        assert command._pending == {}
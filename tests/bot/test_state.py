@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from bot.management._state import VerifiedUserState
+from bot.models import TgUser
+from goals.models import Goal
+from tests.bot.utils import FakeClient, make_message
+
+
+def handle(chat_id: int, text: str) -> FakeClient:
+    tg_user = TgUser.objects.get(telegram_chat_id=chat_id)
+    client = FakeClient()
+    VerifiedUserState(tg_user=tg_user, tg_client=client, message=make_message(chat_id, text)).run()
+    return client
+
+
+@pytest.mark.django_db
+class TestVerifiedUserState:
+    @pytest.fixture
+    def tg_users(self, user, another_user, board):
+        return (
+            TgUser.objects.create(telegram_chat_id='1', telegram_user_id='1', user=user),
+            TgUser.objects.create(telegram_chat_id='2', telegram_user_id='2', user=another_user),
+        )
+
+    def test_dialog_state_is_kept_per_chat(self, tg_users, board):
+        _, category = board
+
+        handle(1, '/create')
+        handle(1, str(category.id))
+        handle(2, 'hello')
+        handle(1, 'New goal')
+
+        assert Goal.objects.get().title == 'New goal'
+        assert Goal.objects.get().category == category
+        assert not TgUser.objects.get(telegram_chat_id='1').is_create_command
+        assert not TgUser.objects.get(telegram_chat_id='2').is_create_command
+
+    def test_expired_state_is_reset(self, tg_users, board):
+        _, category = board
+        handle(1, '/create')
+        handle(1, str(category.id))
+        TgUser.objects.filter(telegram_chat_id='1').update(state_expires_at=timezone.now() - timedelta(seconds=1))
+
+        handle(1, 'New goal')
+
+        assert not Goal.objects.exists()
+
+    def test_goals_of_deleted_categories_are_hidden(self, tg_users, board, goal_factory, category_factory, user):
+        board, category = board
+        goal_factory.create(category=category, user=user, title='Visible')
+        deleted = category_factory.create(board=board, user=user, is_deleted=True)
+        goal_factory.create(category=deleted, user=user, title='Hidden')
+
+        client = handle(1, '/goals')
+
+        assert client.sent == [(1, 'Visible')]
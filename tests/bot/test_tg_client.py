@@ -0,0 +1,108 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from bot.tg.client import TgClient
+
+MESSAGE = {
+    'message_id': 1,
+    'from': {'id': 1, 'is_bot': False, 'first_name': 'user', 'username': 'user'},
+    'chat': {'id': 1, 'first_name': 'user'},
+    'date': 0,
+    'text': 'text',
+}
+
+
+class StubTelegram(BaseHTTPRequestHandler):
+    """Отдает заранее заданные ответы по очереди и запоминает пришедшие запросы."""
+    responses: list[tuple[int, dict]] = []
+    requests: list[str] = []
+    ports: set[int] = set()
+
+    def _reply(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.requests.append(self.path)
+        self.ports.add(self.client_address[1])
+        status_code, body = self.responses.pop(0)
+        payload = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubTelegram.responses, StubTelegram.requests, StubTelegram.ports = [], [], set()
+    StubTelegram.protocol_version = 'HTTP/1.1'
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubTelegram)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def tg_client(stub_server) -> TgClient:
+    client = TgClient('token', base_url=f'http://127.0.0.1:{stub_server.server_port}', backoff_factor=0.01)
+    yield client
+    client.close()
+
+
+@pytest.mark.django_db
+class TestTgClient:
+    def test_connection_is_reused(self, tg_client):
+        StubTelegram.responses = [(200, {'ok': True, 'result': MESSAGE})] * 3
+
+        for _ in range(3):
+            assert tg_client.send_message(chat_id=1, text='text').ok
+
+        assert len(StubTelegram.ports) == 1
+        assert tg_client.stats.requests == 3
+        assert tg_client.stats.retries == 0
+
+    def test_retry_on_server_error(self, tg_client):
+        StubTelegram.responses = [(502, {}), (500, {}), (200, {'ok': True, 'result': []})]
+
+        response = tg_client.get_updates(offset=5, timeout=0)
+
+        assert response.ok
+        assert len(StubTelegram.requests) == 3
+        assert tg_client.stats.retries == 2
+
+    def test_retry_after_is_honoured(self, tg_client, monkeypatch):
+        delays: list[float] = []
+        monkeypatch.setattr('bot.tg.client.time.sleep', delays.append)
+        StubTelegram.responses = [
+            (429, {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 3}}),
+            (200, {'ok': True, 'result': MESSAGE}),
+        ]
+
+        assert tg_client.send_message(chat_id=1, text='text').ok
+        assert delays == [3.0]
+
+    def test_gives_up_after_max_retries(self, tg_client):
+        tg_client.max_retries = 2
+        StubTelegram.responses = [(503, {})] * 3
+
+        with pytest.raises(requests.HTTPError):
+            tg_client.send_message(chat_id=1, text='text')
+
+        assert len(StubTelegram.requests) == 3
+        assert tg_client.stats.failures == 1
+
+    def test_client_error_is_not_retried(self, tg_client):
+        StubTelegram.responses = [(400, {'ok': False, 'error_code': 400})]
+
+        assert not tg_client.send_message(chat_id=1, text='text').ok
+        assert len(StubTelegram.requests) == 1
@@ -0,0 +1,59 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from bot.tg.dc import Message
+
+UPDATE = {
+    'update_id': 10,
+    'message': {
+        'message_id': 1,
+        'from': {'id': 1, 'is_bot': False, 'first_name': 'user', 'username': 'user'},
+        'chat': {'id': 1, 'first_name': 'user'},
+        'date': 0,
+        'text': '/goals',
+    },
+}
+
+
+class FakeDispatcher:
+    def __init__(self):
+        self.submitted: list[Message] = []
+
+    def submit(self, message: Message) -> None:
+        self.submitted.append(message)
+
+
+@pytest.mark.django_db
+class TestBotWebhook:
+    url = reverse('telegram_webhook')
+
+    @pytest.fixture
+    def dispatcher(self, monkeypatch) -> FakeDispatcher:
+        dispatcher = FakeDispatcher()
+        monkeypatch.setattr('todolist.settings.BOT_WEBHOOK_SECRET', 'secret')
+        monkeypatch.setattr('bot.views.get_webhook_dispatcher', lambda: dispatcher)
+        return dispatcher
+
+    def post(self, client, data: dict, secret: str = 'secret'):
+        return client.post(self.url, data=data, format='json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN=secret)
+
+    def test_update_is_dispatched_once(self, client, dispatcher):
+        first = self.post(client, UPDATE)
+        repeated = self.post(client, UPDATE)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert repeated.status_code == status.HTTP_200_OK
+        assert [message.text for message in dispatcher.submitted] == ['/goals']
+
+    def test_wrong_secret(self, client, dispatcher):
+        response = self.post(client, UPDATE, secret='wrong')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert dispatcher.submitted == []
+
+    def test_unsupported_update_is_acknowledged(self, client, dispatcher):
+        response = self.post(client, {'update_id': 11, 'edited_message': {}})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert dispatcher.submitted == []
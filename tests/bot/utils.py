@@ -0,0 +1,21 @@
+from bot.tg.dc import Message
+
+
+class FakeClient:
+    """Заменяет TgClient и запоминает отправленные сообщения."""
+
+    def __init__(self):
+        self.sent: list[tuple[int, str]] = []
+
+    def send_message(self, chat_id: int, text: str) -> None:
+        self.sent.append((chat_id, text))
+
+
+def make_message(chat_id: int, text: str) -> Message:
+    return Message(**{
+        'message_id': 1,
+        'from': {'id': chat_id, 'is_bot': False, 'first_name': 'user', 'username': 'user'},
+        'chat': {'id': chat_id, 'first_name': 'user'},
+        'date': 0,
+        'text': text,
+    })
@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from pytest_factoryboy import register
 from rest_framework.test import APIClient
 
@@ -119,3 +120,10 @@ def alien_comment_alien_board_reader(goal_alien_board_reader, comment_factory, a
 @pytest.fixture
 def comment_alien_board_reader(goal_alien_board_reader, comment_factory) -> GoalComment:
     return comment_factory.create(goal=goal_alien_board_reader)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
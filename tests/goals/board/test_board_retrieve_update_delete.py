@@ -1,4 +1,7 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 
@@ -239,6 +242,35 @@ class TestBoardUpdate:
         assert BoardParticipant.objects.count() == 1
         assert board.participants.last().user == user
 
+    def test_update_participants_applies_only_diff(self, auth_client, board, user, user_factory):
+        board, _ = board
+        kept, changed, removed, added = user_factory.create_batch(4)
+        kept_participant = BoardParticipant.objects.create(board=board, user=kept, role=BoardParticipant.Role.reader)
+        changed_participant = BoardParticipant.objects.create(
+            board=board, user=changed, role=BoardParticipant.Role.reader
+        )
+        BoardParticipant.objects.create(board=board, user=removed, role=BoardParticipant.Role.reader)
+
+        url = reverse('goals:retrieve_update_destroy_board', args=[board.id])
+        response = auth_client.patch(url, data={
+            'participants': [
+                {'role': BoardParticipant.Role.reader, 'user': kept.username},
+                {'role': BoardParticipant.Role.writer, 'user': changed.username},
+                {'role': BoardParticipant.Role.reader, 'user': added.username},
+            ],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert dict(board.participants.values_list('user_id', 'role')) == {
+            user.id: BoardParticipant.Role.owner,
+            kept.id: BoardParticipant.Role.reader,
+            changed.id: BoardParticipant.Role.writer,
+            added.id: BoardParticipant.Role.reader,
+        }
+        assert board.participants.get(user=kept) == kept_participant
+        assert board.participants.get(user=kept).updated == kept_participant.updated
+        assert board.participants.get(user=changed).id == changed_participant.id
+
     def test_update_unauthorized(self, client):
         url = reverse('goals:retrieve_update_destroy_board', args=[1])
 
@@ -257,6 +289,7 @@ class TestBoardDestroy:
 
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
+        call_command('run_cascade_jobs', once=True, stdout=StringIO())
         board.refresh_from_db()
         goal.refresh_from_db()
         category.refresh_from_db()
@@ -61,3 +61,21 @@ class TestBoardsList:
         assert offset_response.status_code == status.HTTP_200_OK
         assert offset_response.json()['count'] == 10
         assert len(offset_response.json()['results']) == 2
+
+    def test_search_by_title(self, auth_client, board_factory, user):
+        for title in ['Work', 'Homework', 'Garden']:
+            board_factory.create(title=title, with_owner=user)
+
+        response = auth_client.get(self.url, {'search': 'work'})
+
+        assert response.status_code == status.HTTP_200_OK
+        # На PostgreSQL порядок задаёт похожесть, на SQLite — сортировка списка, поэтому сравнивается множество.
+        assert {board['title'] for board in response.json()} == {'Homework', 'Work'}
+
+    def test_search_with_explicit_ordering(self, auth_client, board_factory, user):
+        for title in ['Work', 'Homework', 'Garden']:
+            board_factory.create(title=title, with_owner=user)
+
+        response = auth_client.get(self.url, {'search': 'work', 'ordering': 'title'})
+
+        assert [board['title'] for board in response.json()] == ['Homework', 'Work']
@@ -1,4 +1,7 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 
@@ -148,6 +151,7 @@ class TestDestroyCategory(BaseTestCase):
         url = reverse('goals:retrieve_update_destroy_category', args=[category.id])
 
         response = auth_client.delete(url)
+        call_command('run_cascade_jobs', once=True, stdout=StringIO())
 
         goal.refresh_from_db()
 
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Goal, GoalComment, GoalStatistic
+
+
+@pytest.mark.django_db
+class TestGoalBatch:
+    url = reverse('goals:goal_batch')
+
+    def test_create_many_goals_in_constant_queries(self, auth_client, board):
+        _, category = board
+        operations = [
+            {'action': 'create', 'data': {'category': category.id, 'title': f'Goal {i}'}} for i in range(50)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.post(self.url, {'operations': operations}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {result['status'] for result in response.data['results']} == {status.HTTP_201_CREATED}
+        assert Goal.objects.filter(category=category).count() == 50
+        assert GoalStatistic.objects.get(category=category).count == 50
+        assert len(queries) < 20
+
+    def test_update_and_archive(self, auth_client, goal, goal_factory, user, comment, alien_board_writer):
+        _, category = alien_board_writer
+        other = goal_factory.create(user=user, category=goal.category)
+        operations = [
+            {'action': 'update', 'id': goal.id, 'data': {'title': 'Renamed', 'category': category.id}},
+            {'action': 'archive', 'id': other.id},
+        ]
+
+        response = auth_client.post(self.url, {'operations': operations}, format='json')
+
+        assert response.data['results'] == [
+            {'status': status.HTTP_200_OK, 'id': goal.id},
+            {'status': status.HTTP_200_OK, 'id': other.id},
+        ]
+        goal.refresh_from_db()
+        assert (goal.title, goal.category_id, goal.board_id) == ('Renamed', category.id, category.board_id)
+        assert GoalComment.objects.get(id=comment.id).board_id == category.board_id
+        assert Goal.objects.get(id=other.id).status == Goal.Status.archived
+        assert Goal.objects.get(id=other.id).archived_at is not None
+
+    def test_per_item_errors(self, auth_client, board, goal_alien_board_reader, goal_alien_board, alien_board_reader):
+        _, category = board
+        _, reader_category = alien_board_reader
+        operations = [
+            {'action': 'create', 'data': {'category': category.id}},
+            {'action': 'create', 'data': {'category': reader_category.id, 'title': 'Goal'}},
+            {'action': 'archive', 'id': goal_alien_board_reader.id},
+            {'action': 'archive', 'id': goal_alien_board.id},
+            {'action': 'create', 'data': {'category': category.id, 'title': 'Goal'}},
+        ]
+
+        response = auth_client.post(self.url, {'operations': operations}, format='json')
+
+        assert [result['status'] for result in response.data['results']] == [
+            status.HTTP_400_BAD_REQUEST,
+            status.HTTP_403_FORBIDDEN,
+            status.HTTP_403_FORBIDDEN,
+            status.HTTP_404_NOT_FOUND,
+            status.HTTP_201_CREATED,
+        ]
+        assert Goal.objects.filter(category=category).count() == 1
+
+    def test_empty_batch_is_rejected(self, auth_client):
+        response = auth_client.post(self.url, {'operations': []}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,127 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command, CommandError
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Goal, GoalCategory, GoalStatistic
+
+
+def upload(name: str, content: str) -> SimpleUploadedFile:
+    return SimpleUploadedFile(name, content.encode())
+
+
+@pytest.mark.django_db
+class TestGoalImport:
+    url = reverse('goals:goal_import')
+
+    def test_csv_creates_goals_and_categories(self, auth_client, board, settings):
+        settings.GOAL_IMPORT_BATCH_SIZE = 2
+        board, category = board
+        content = (
+            'category,title,priority,status,due_date\n'
+            f'{category.title},First,1,,\n'
+            f'{category.title},Second,4,2,2030-01-01T00:00:00Z\n'
+            'Imported,Third,,,\n'
+            'Imported,,2,,\n'
+        )
+
+        response = auth_client.post(self.url, {'file': upload('goals.csv', content), 'board': board.id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data['created'], response.data['failed']) == (3, 1)
+        assert response.data['errors'][0]['row'] == 5
+        assert 'title' in response.data['errors'][0]['errors']
+        imported = GoalCategory.objects.get(title='Imported')
+        assert imported.board_id == board.id
+        assert Goal.objects.filter(category=imported, board=board).count() == 1
+        assert Goal.objects.get(title='Second').status == Goal.Status.in_progress
+        assert sum(GoalStatistic.objects.values_list('count', flat=True)) == 3
+
+    def test_ndjson_reports_unreadable_lines(self, auth_client, board):
+        board, category = board
+        content = '\n'.join([
+            json.dumps({'category': category.title, 'title': 'One'}),
+            'not json',
+            '[1, 2]',
+            json.dumps({'category': category.title, 'title': 'Two', 'priority': 9}),
+        ])
+
+        response = auth_client.post(self.url, {'file': upload('goals.ndjson', content), 'board': board.id})
+
+        assert (response.data['created'], response.data['failed']) == (1, 3)
+        assert [error['row'] for error in response.data['errors']] == [2, 3, 4]
+
+    def test_reader_cannot_import(self, auth_client, alien_board_reader):
+        board, category = alien_board_reader
+        content = json.dumps({'category': category.title, 'title': 'One'})
+
+        response = auth_client.post(self.url, {'file': upload('goals.ndjson', content), 'board': board.id})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Goal.objects.exists()
+
+    def test_unknown_format(self, auth_client, board):
+        board, _ = board
+
+        response = auth_client.post(self.url, {'file': upload('goals.txt', ''), 'board': board.id})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_command(self, board, user, tmp_path):
+        board, category = board
+        path = tmp_path / 'goals.csv'
+        path.write_text(f'category,title\n{category.title},One\n{category.title},\n')
+        out, err = StringIO(), StringIO()
+
+        call_command('import_goals', str(path), board=board.id, user=user.username, stdout=out, stderr=err)
+
+        assert 'Created 1 goals, 1 rows failed' in out.getvalue()
+        assert 'Row 3' in err.getvalue()
+        assert Goal.objects.get().category_id == category.id
+
+    def test_non_utf8_file_is_rejected(self, auth_client, board):
+        board, category = board
+        content = f'category,title\n{category.title},Первая\n{category.title},Вторая\n'.encode('cp1251')
+
+        response = auth_client.post(
+            self.url, {'file': SimpleUploadedFile('goals.csv', content), 'board': board.id}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'Строка 2' in response.data['file'][0]
+        assert not Goal.objects.exists()
+
+    def test_failed_batch_reports_only_failing_rows(self, auth_client, board, settings, monkeypatch):
+        settings.GOAL_IMPORT_BATCH_SIZE = 3
+        board, _ = board
+        bulk_create = Goal.objects.bulk_create
+
+        def fail_on_bad_title(goals, *args, **kwargs):
+            if any(goal.title == 'Bad' for goal in goals):
+                raise DatabaseError('bad row')
+            return bulk_create(goals, *args, **kwargs)
+
+        monkeypatch.setattr(Goal.objects, 'bulk_create', fail_on_bad_title)
+        content = 'category,title\nNew,First\nBroken,Bad\nNew,Third\n'
+
+        response = auth_client.post(self.url, {'file': upload('goals.csv', content), 'board': board.id})
+
+        assert (response.data['created'], response.data['failed']) == (2, 1)
+        assert response.data['errors'] == [{'row': 3, 'errors': {'non_field_errors': ['bad row']}}]
+        assert set(Goal.objects.values_list('title', flat=True)) == {'First', 'Third'}
+        assert not GoalCategory.objects.filter(title='Broken').exists()
+        assert GoalCategory.objects.filter(title='New').count() == 1
+        assert sum(GoalStatistic.objects.values_list('count', flat=True)) == 2
+
+    def test_command_rejects_non_utf8_file(self, board, user, tmp_path):
+        board, category = board
+        path = tmp_path / 'goals.csv'
+        path.write_bytes(f'category,title\n{category.title},Цель\n'.encode('cp1251'))
+
+        with pytest.raises(CommandError, match='Line 2'):
+            call_command('import_goals', str(path), board=board.id, user=user.username, stdout=StringIO())
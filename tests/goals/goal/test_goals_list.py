@@ -1,7 +1,15 @@
+from unittest import mock
+
 import pytest
+from django.db.models import F, Value
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
+from goals.models import Goal
+from goals.pagination import GoalCursorPagination
 from goals.serializers import GoalSerializer
 from tests.goals.utils import BaseTestCase
 
@@ -78,3 +86,85 @@ class TestGoalList(BaseTestCase):
         assert response.status_code == status.HTTP_200_OK
         assert '2023-02-24' in self.date_time_str(response.json()[0]['due_date'])
         assert '2024-01-01' in self.date_time_str(response.json()[-1]['due_date'])
+
+    def test_cursor_pagination(self, auth_client, board, goal_factory):
+        _, category = board
+        goal_factory.create(category=category, due_date=None, priority=1)
+        goal_factory.create_batch(3, category=category, due_date='2023-02-24T00:00:00Z', priority=2)
+        goal_factory.create(category=category, due_date='2023-01-01T00:00:00Z', priority=1)
+        goal_factory.create(category=category, due_date=None, priority=4)
+
+        ids: list[int] = []
+        response = auth_client.get(self.url, {'cursor': '', 'limit': 2})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.json()
+            ids.extend(goal['id'] for goal in response.json()['results'])
+            if not response.json()['next']:
+                break
+            response = auth_client.get(response.json()['next'])
+
+        expected = list(
+            Goal.objects.order_by(F('due_date').asc(nulls_last=True), '-priority', 'id').values_list('id', flat=True)
+        )
+        assert ids == expected
+
+    def test_cursor_pagination_descending_with_filters(self, auth_client, board, goal_factory):
+        _, category = board
+        for date in ['2024-01-01T00:00:00Z', '2023-02-24T00:00:00Z', '2023-06-01T00:00:00Z']:
+            goal_factory.create(category=category, due_date=date, priority=Goal.Priority.high)
+        goal_factory.create(category=category, due_date='2023-03-01T00:00:00Z', priority=Goal.Priority.low)
+
+        params = {'cursor': '', 'limit': 1, 'ordering': '-due_date', 'priority': Goal.Priority.high}
+        first = auth_client.get(self.url, params).json()
+        second = auth_client.get(first['next']).json()
+        third = auth_client.get(second['next']).json()
+
+        assert [page['results'][0]['due_date'][:10] for page in (first, second, third)] == [
+            '2024-01-01', '2023-06-01', '2023-02-24'
+        ]
+        assert third['next'] is None
+
+    @pytest.mark.parametrize('ordering', ['title', 'priority', 'due_date,title'])
+    def test_cursor_rejects_unsupported_ordering(self, auth_client, board, ordering):
+        response = auth_client.get(self.url, {'cursor': '', 'ordering': ordering})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'ordering' in response.json()
+
+    def test_cursor_rejects_search_rank_ordering(self):
+        # Ранг считает только PostgreSQL: здесь его заменяет константа с той же сортировкой, что у фильтра.
+        request = Request(APIRequestFactory().get(self.url, {'cursor': '', 'search': 'goal'}))
+        queryset = Goal.objects.annotate(rank=Value(1.0)).order_by('-rank', 'id')
+
+        with pytest.raises(ValidationError):
+            GoalCursorPagination().paginate_queryset(queryset, request)
+
+    def test_invalid_cursor(self, auth_client, board):
+        response = auth_client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_full_text_search_falls_back_to_ilike_on_sqlite(self, auth_client, board, goal_factory, settings):
+        settings.GOAL_FULL_TEXT_SEARCH = True
+        _, category = board
+        goal_factory.create(category=category, title='Купить молоко')
+        goal_factory.create(category=category, title='Позвонить', description='про молоко')
+        goal_factory.create(category=category, title='Прочее')
+
+        response = auth_client.get(self.url, {'search': 'молоко'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {goal['title'] for goal in response.data} == {'Купить молоко', 'Позвонить'}
+        assert all('search_vector' not in goal for goal in response.data)
+
+    @pytest.mark.parametrize('enabled', [False, True])
+    def test_search_vector_maintained_only_with_full_text_search(self, goal, settings, enabled):
+        settings.GOAL_FULL_TEXT_SEARCH = enabled
+        with mock.patch('goals.search.connection') as connection, \
+                mock.patch('goals.search.goal_search_vector', return_value=None) as vector:
+            connection.vendor = 'postgresql'
+            goal.title = 'Новое название'
+            goal.save()
+
+        assert vector.called is enabled
@@ -0,0 +1,34 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalComment, GoalStatistic
+
+
+@pytest.mark.django_db
+class TestBenchmarkCommands:
+    def test_generate_dataset(self):
+        call_command(
+            'generate_dataset', users=5, boards=4, categories=2, goals=3, comments=1, prefix='gen', stdout=StringIO()
+        )
+
+        assert User.objects.filter(username__startswith='gen_').count() == 5
+        assert Board.objects.count() == 4
+        assert BoardParticipant.objects.filter(role=BoardParticipant.Role.owner).count() == 4
+        assert all(goal.board_id == goal.category.board_id for goal in Goal.objects.select_related('category'))
+        assert all(comment.board_id == comment.goal.board_id for comment in GoalComment.objects.select_related('goal'))
+        assert GoalStatistic.objects.aggregate(total=Sum('count'))['total'] == Goal.objects.count()
+
+    def test_benchmark_api(self):
+        call_command('generate_dataset', users=3, boards=3, goals=2, stdout=StringIO())
+        out = StringIO()
+
+        call_command('benchmark_api', requests=30, stdout=out)
+
+        report = out.getvalue()
+        assert 'Throughput' in report
+        total = next(line for line in report.splitlines() if line.startswith('total')).split()
+        assert total[1:3] == ['30', '0']
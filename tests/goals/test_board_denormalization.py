@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Goal, GoalComment
+
+
+@pytest.mark.django_db
+class TestDenormalizedBoard:
+    def test_board_is_set_on_create(self, comment, board):
+        board, _ = board
+
+        assert comment.goal.board_id == board.id
+        assert comment.board_id == board.id
+
+    def test_goal_moves_to_another_category(self, auth_client, comment, alien_board_writer):
+        board, category = alien_board_writer
+        goal = comment.goal
+
+        url = reverse('goals:retrieve_update_goal', args=[goal.id])
+        response = auth_client.patch(url, data={'category': category.id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Goal.objects.get(id=goal.id).board_id == board.id
+        assert GoalComment.objects.get(id=comment.id).board_id == board.id
+
+    def test_category_moves_to_another_board(self, comment, board_factory):
+        new_board = board_factory.create()
+        category = comment.goal.category
+        category.board = new_board
+        category.save()
+
+        assert Goal.objects.get(id=comment.goal_id).board_id == new_board.id
+        assert GoalComment.objects.get(id=comment.id).board_id == new_board.id
+
+    def test_check_board_ids_fixes_drift(self, comment, board_factory):
+        Goal.objects.update(board=board_factory.create())
+        GoalComment.objects.update(board=board_factory.create())
+
+        out = StringIO()
+        call_command('check_board_ids', fix=True, stdout=out)
+
+        assert 'Goals with wrong board_id: 1' in out.getvalue()
+        assert Goal.objects.get().board_id == comment.goal.category.board_id
+        assert GoalComment.objects.get().board_id == comment.goal.category.board_id
@@ -0,0 +1,67 @@
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals import cascade
+from goals.models import CascadeJob, Goal
+
+
+@pytest.mark.django_db
+class TestCascadeJobs:
+    def test_board_destroy_hides_goals_and_archives_in_chunks(self, auth_client, board, goal_factory, user):
+        board, category = board
+        goals = goal_factory.create_batch(5, category=category, user=user)
+
+        response = auth_client.delete(reverse('goals:retrieve_update_destroy_board', args=[board.id]))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert auth_client.get(reverse('goals:list_of_goals')).data == []
+        assert not Goal.objects.filter(status=Goal.Status.archived).exists()
+
+        job = cascade.claim_next_job()
+        # Число целей считает воркер, а не запрос удаления.
+        assert job.total is None
+        with mock.patch('goals.cascade.statistics.archive_goals', wraps=cascade.statistics.archive_goals) as archive:
+            cascade.run_job(job, chunk_size=2)
+
+        assert archive.call_count == 3
+        job.refresh_from_db()
+        assert (job.status, job.processed, job.total, job.cursor) == (CascadeJob.Status.done, 5, 5, goals[-1].id)
+        assert Goal.objects.filter(status=Goal.Status.archived).count() == 5
+
+    def test_failed_chunk_is_retried_from_cursor(self, board, goal_factory, user, settings):
+        settings.CASCADE_MAX_ATTEMPTS = 2
+        _, category = board
+        goal_factory.create_batch(3, category=category, user=user)
+        cascade.enqueue(CascadeJob.Kind.category, category.id)
+
+        job = cascade.claim_next_job()
+        with mock.patch('goals.cascade.statistics.archive_goals', side_effect=RuntimeError('boom')):
+            cascade.run_job(job)
+
+        job.refresh_from_db()
+        assert job.status == CascadeJob.Status.pending
+        assert 'boom' in job.last_error
+        assert cascade.claim_next_job() is None
+
+        CascadeJob.objects.update(run_after=timezone.now())
+        job = cascade.claim_next_job()
+        cascade.run_job(job)
+
+        job.refresh_from_db()
+        assert (job.status, job.attempts, job.processed) == (CascadeJob.Status.done, 2, 3)
+
+    def test_job_fails_after_max_attempts(self, board, settings):
+        settings.CASCADE_MAX_ATTEMPTS = 1
+        _, category = board
+        cascade.enqueue(CascadeJob.Kind.category, category.id)
+
+        job = cascade.claim_next_job()
+        with mock.patch('goals.cascade._process', side_effect=RuntimeError('boom')):
+            cascade.run_job(job)
+
+        job.refresh_from_db()
+        assert job.status == CascadeJob.Status.failed
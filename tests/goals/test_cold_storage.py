@@ -0,0 +1,108 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals import cold_storage
+from goals.models import ArchivedGoal, ArchivedGoalComment, Goal, GoalComment, GoalStatistic
+
+
+def age(goals, days: int) -> None:
+    Goal.objects.filter(id__in=[goal.id for goal in goals]).update(archived_at=timezone.now() - timedelta(days=days))
+
+
+@pytest.mark.django_db
+class TestColdStorage:
+    def test_command_moves_old_archived_goals_with_comments(self, board, goal_factory, comment_factory, user):
+        _, category = board
+        old = goal_factory.create_batch(3, category=category, user=user, status=Goal.Status.archived)
+        recent = goal_factory.create(category=category, user=user, status=Goal.Status.archived)
+        active = goal_factory.create(category=category, user=user)
+        comment = comment_factory.create(goal=old[0], user=user)
+        age(old + [active], days=100)
+
+        call_command('archive_old_goals', days=90, chunk_size=2, stdout=StringIO())
+
+        assert set(Goal.objects.values_list('id', flat=True)) == {recent.id, active.id}
+        assert set(ArchivedGoal.objects.values_list('id', flat=True)) == {goal.id for goal in old}
+        assert not GoalComment.objects.exists()
+        archived_comment = ArchivedGoalComment.objects.get()
+        assert (archived_comment.id, archived_comment.goal_id, archived_comment.text) == (
+            comment.id, old[0].id, comment.text
+        )
+        assert GoalStatistic.objects.get(status=Goal.Status.archived).count == 1
+
+    def test_rerun_has_nothing_to_move(self, goal, user):
+        goal.status = Goal.Status.archived
+        goal.save()
+        age([goal], days=100)
+
+        assert cold_storage.move_chunk(timezone.now(), 10) == 1
+        assert cold_storage.move_chunk(timezone.now(), 10) == 0
+        assert ArchivedGoal.objects.count() == 1
+
+    def test_destroy_marks_archive_time(self, auth_client, goal):
+        Goal.objects.filter(id=goal.id).update(updated=timezone.now() - timedelta(days=100))
+
+        auth_client.delete(reverse('goals:retrieve_update_goal', args=[goal.id]))
+
+        assert Goal.objects.get(id=goal.id).archived_at > timezone.now() - timedelta(minutes=1)
+        assert cold_storage.move_chunk(timezone.now() - timedelta(days=90), 10) == 0
+
+    def test_later_edits_do_not_postpone_move(self, goal):
+        goal.status = Goal.Status.archived
+        goal.save()
+        age([goal], days=100)
+        goal.title = 'Edited in archive'
+        goal.save(update_fields=('title', 'updated'))
+
+        assert cold_storage.move_chunk(timezone.now() - timedelta(days=90), 10) == 1
+
+    def test_archive_time_follows_status(self, goal):
+        goal.status = Goal.Status.archived
+        goal.save(update_fields=('status', 'updated'))
+        assert Goal.objects.get(id=goal.id).archived_at is not None
+
+        goal.status = Goal.Status.to_do
+        goal.save(update_fields=('status', 'updated'))
+        assert Goal.objects.get(id=goal.id).archived_at is None
+
+    def test_browse_and_restore(self, auth_client, goal, comment):
+        created = Goal.objects.get(id=goal.id).created
+        goal.status = Goal.Status.archived
+        goal.save()
+        cold_storage.move_chunk(timezone.now(), 10)
+
+        response = auth_client.get(reverse('goals:list_of_archived_goals'))
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data] == [goal.id]
+
+        response = auth_client.get(reverse('goals:retrieve_archived_goal', args=[goal.id]))
+        assert [item['id'] for item in response.data['comments']] == [comment.id]
+
+        response = auth_client.post(reverse('goals:restore_archived_goal', args=[goal.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        restored = Goal.objects.get(id=goal.id)
+        assert (restored.status, restored.created) == (Goal.Status.to_do, created)
+        assert GoalComment.objects.get().created == comment.created
+        assert not ArchivedGoal.objects.exists()
+        assert GoalStatistic.objects.get(status=Goal.Status.to_do).count == 1
+
+    def test_alien_and_reader_cannot_restore(self, auth_client, goal_alien_board, goal_alien_board_reader):
+        Goal.objects.update(status=Goal.Status.archived, archived_at=timezone.now())
+        cold_storage.move_chunk(timezone.now(), 10)
+
+        response = auth_client.get(reverse('goals:list_of_archived_goals'))
+        assert [item['id'] for item in response.data] == [goal_alien_board_reader.id]
+
+        alien = auth_client.post(reverse('goals:restore_archived_goal', args=[goal_alien_board.id]))
+        reader = auth_client.post(reverse('goals:restore_archived_goal', args=[goal_alien_board_reader.id]))
+
+        assert alien.status_code == status.HTTP_404_NOT_FOUND
+        assert reader.status_code == status.HTTP_403_FORBIDDEN
+        assert ArchivedGoal.objects.count() == 2
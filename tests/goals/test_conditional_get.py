@@ -0,0 +1,96 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import BoardParticipant
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_goal_list_not_modified(self, auth_client, goal, goal_factory, user):
+        url = reverse('goals:list_of_goals')
+        etag = auth_client.get(url)['ETag']
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+        goal_factory.create(user=user, category=goal.category)
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+
+    def test_list_ignores_if_modified_since_after_delete(self, auth_client, comment, comment_factory, user):
+        comment_factory.create(goal=comment.goal, user=user)
+        url = reverse('goals:list_of_comments')
+        response = auth_client.get(url)
+        assert 'Last-Modified' not in response
+
+        comment.delete()
+        response = auth_client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
+    def test_detail_keeps_last_modified(self, auth_client, goal):
+        url = reverse('goals:retrieve_update_goal', args=[goal.id])
+        last_modified = auth_client.get(url)['Last-Modified']
+
+        response = auth_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_goal_detail_changes_with_update(self, auth_client, goal):
+        url = reverse('goals:retrieve_update_goal', args=[goal.id])
+        response = auth_client.get(url)
+        etag = response['ETag']
+
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        auth_client.patch(url, {'title': 'New title'})
+
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_visibility_change_invalidates_etag(self, auth_client, board, board_participant_factory, user):
+        url = reverse('goals:board_list')
+        etag = auth_client.get(url)['ETag']
+        board_participant_factory.create(user=user, role=BoardParticipant.Role.owner)
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+
+    def test_board_participants_change_invalidates_etag(self, auth_client, board, board_participant_factory):
+        board, _ = board
+        url = reverse('goals:retrieve_update_destroy_board', args=[board.id])
+        etag = auth_client.get(url)['ETag']
+        board_participant_factory.create(board=board, role=BoardParticipant.Role.reader)
+
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_author_profile_change_invalidates_etag(self, auth_client, goal, user):
+        for url in (reverse('goals:list_of_goals'), reverse('goals:retrieve_update_goal', args=[goal.id])):
+            etag = auth_client.get(url)['ETag']
+            assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+            user.first_name = f'Renamed for {url}'
+            user.save()
+
+            response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+
+    def test_participant_rename_invalidates_board_etag(self, auth_client, board, board_participant_factory):
+        board, _ = board
+        participant = board_participant_factory.create(board=board, role=BoardParticipant.Role.reader)
+        url = reverse('goals:retrieve_update_destroy_board', args=[board.id])
+        etag = auth_client.get(url)['ETag']
+
+        participant.user.username = 'renamed'
+        participant.user.save()
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert 'renamed' in [item['user'] for item in response.data['participants']]
@@ -0,0 +1,14 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_explain_querysets(goal, user):
+    out = StringIO()
+    call_command('explain_querysets', user=user.id, stdout=out)
+
+    output = out.getvalue()
+    for view_name in ('GoalListView', 'GoalView', 'GoalCommentListView', 'BoardListView'):
+        assert view_name in output
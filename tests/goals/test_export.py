@@ -0,0 +1,48 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Goal
+
+
+def content(response) -> bytes:
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestExport:
+    def test_ndjson_contains_only_visible_rows(self, auth_client, board, goal, comment, goal_alien_board, goal_factory):
+        board, category = board
+        goal_factory.create(category=category, user=goal.user, status=Goal.Status.archived)
+
+        response = auth_client.get(reverse('goals:export', args=['ndjson']))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        rows = [json.loads(line) for line in content(response).decode().splitlines()]
+        assert [(row['type'], row['id']) for row in rows] == [
+            ('board', board.id), ('category', category.id), ('goal', goal.id), ('comment', comment.id),
+        ]
+        assert rows[2]['title'] == goal.title
+        assert rows[3]['user'] == comment.user.username
+
+    def test_csv_gzip(self, auth_client, goal):
+        response = auth_client.get(reverse('goals:export', args=['csv']), {'gzip': 1})
+
+        assert response['Content-Type'] == 'application/gzip'
+        assert 'export.csv.gz' in response['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(content(response)).decode())))
+        assert [row['type'] for row in rows] == ['board', 'category', 'goal']
+        assert rows[2]['id'] == str(goal.id)
+        assert rows[2]['category'] == str(goal.category_id)
+
+    def test_unknown_format(self, auth_client):
+        assert auth_client.get(reverse('goals:export', args=['xml'])).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_anonymous(self, client):
+        assert client.get(reverse('goals:export', args=['csv'])).status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,55 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from goals.models import BoardParticipant
+
+
+def capture(client, url: str) -> list[str]:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [query['sql'] for query in context.captured_queries]
+
+
+@pytest.mark.django_db
+class TestListQueries:
+    """Число запросов не зависит от числа строк, а пароль и аватар авторов не читаются."""
+
+    @pytest.mark.parametrize('url', [
+        reverse('goals:list_of_goals'),
+        reverse('goals:list_of_comments'),
+        reverse('goals:list_of_categories'),
+    ])
+    def test_lists(self, auth_client, board, goal_factory, comment_factory, category_factory, user_factory, url):
+        board, category = board
+
+        def add_rows(count: int) -> None:
+            for _ in range(count):
+                author = user_factory.create()
+                goal = goal_factory.create(category=category, user=author)
+                comment_factory.create(goal=goal, user=author)
+                category_factory.create(board=board, user=author)
+
+        add_rows(1)
+        auth_client.get(url)  # прогревает кеш ролей
+        few = capture(auth_client, url)
+        add_rows(5)
+        many = capture(auth_client, url)
+
+        assert len(few) == len(many)
+        # Пароль и аватар читает только загрузка пользователя сессии.
+        assert sum('"password"' in sql for sql in many) == 1
+        assert sum('"avatar"' in sql for sql in many) == 1
+
+    def test_board_detail(self, auth_client, board, board_participant_factory):
+        board, _ = board
+        url = reverse('goals:retrieve_update_destroy_board', args=[board.id])
+
+        auth_client.get(url)
+        few = capture(auth_client, url)
+        board_participant_factory.create_batch(5, board=board, role=BoardParticipant.Role.reader)
+        many = capture(auth_client, url)
+
+        assert len(few) == len(many)
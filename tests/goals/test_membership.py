@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from goals.membership import get_board_roles
+from goals.models import BoardParticipant
+
+
+@pytest.mark.django_db
+class TestBoardMembershipCache:
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, settings):
+        settings.MEMBERSHIP_CACHE_ENABLED = True
+
+    def test_goal_retrieve_uses_cached_roles(self, auth_client, goal, user):
+        url = reverse('goals:retrieve_update_goal', args=[goal.id])
+        get_board_roles(user.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = auth_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not [query for query in ctx.captured_queries if 'goals_boardparticipant' in query['sql']]
+
+    def test_roles_invalidated_on_participant_save_and_delete(self, board, another_user):
+        board, _ = board
+        assert get_board_roles(another_user.id) == {}
+
+        participant = BoardParticipant.objects.create(
+            board=board, user=another_user, role=BoardParticipant.Role.reader
+        )
+        assert get_board_roles(another_user.id) == {board.id: BoardParticipant.Role.reader}
+
+        participant.delete()
+        assert get_board_roles(another_user.id) == {}
+
+    def test_roles_invalidated_on_board_update(self, auth_client, board, another_user):
+        board, _ = board
+        assert get_board_roles(another_user.id) == {}
+
+        url = reverse('goals:retrieve_update_destroy_board', args=[board.id])
+        response = auth_client.patch(url, data={
+            'participants': [{'role': BoardParticipant.Role.writer, 'user': another_user.username}],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert get_board_roles(another_user.id) == {board.id: BoardParticipant.Role.writer}
+
+
+@pytest.mark.django_db
+class TestBoardMembershipWithoutCache:
+    def test_roles_read_once_per_request(self, auth_client, goal):
+        url = reverse('goals:retrieve_update_goal', args=[goal.id])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = auth_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len([query for query in ctx.captured_queries if 'goals_boardparticipant' in query['sql']]) == 1
+
+    def test_role_change_visible_to_next_request(self, auth_client, goal, user):
+        url = reverse('goals:retrieve_update_goal', args=[goal.id])
+        assert auth_client.get(url).status_code == status.HTTP_200_OK
+
+        # Обновление в обход сигналов: так выглядит смена роли, сделанная другим процессом.
+        BoardParticipant.objects.filter(user=user).delete()
+
+        assert auth_client.get(url).status_code == status.HTTP_404_NOT_FOUND
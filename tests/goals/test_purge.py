@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from bot.models import TgUser
+from goals import purge
+from goals.models import Board, BoardParticipant, CascadeJob, Goal, GoalCategory, GoalComment, GoalStatistic
+
+
+def age(days: int) -> None:
+    past = timezone.now() - timedelta(days=days)
+    Board.objects.filter(is_deleted=True).update(deleted_at=past)
+    GoalCategory.objects.filter(is_deleted=True).update(deleted_at=past)
+
+
+@pytest.mark.django_db
+class TestPurge:
+    def test_purges_deleted_board_with_dependent_rows(self, auth_client, board, goal, comment, user):
+        board, category = board
+        tg_user = TgUser.objects.create(telegram_chat_id='1', telegram_user_id='1', category_for_create=category)
+        auth_client.delete(reverse('goals:retrieve_update_destroy_board', args=[board.id]))
+        call_command('run_cascade_jobs', once=True, stdout=StringIO())
+        age(days=40)
+
+        report = purge.purge(timezone.now() - timedelta(days=30), chunk_size=1)
+
+        assert report == {
+            'goals.Board': 1, 'goals.BoardParticipant': 1, 'goals.GoalCategory': 1, 'goals.Goal': 1,
+            'goals.GoalComment': 1, 'goals.GoalStatistic': 2, 'goals.CascadeJob': 1,
+        }
+        for model in (Board, BoardParticipant, GoalCategory, Goal, GoalComment, GoalStatistic, CascadeJob):
+            assert not model.objects.exists()
+        tg_user.refresh_from_db()
+        assert tg_user.category_for_create is None
+
+    def test_dry_run_only_counts(self, auth_client, board, goal):
+        board, _ = board
+        auth_client.delete(reverse('goals:retrieve_update_destroy_board', args=[board.id]))
+        call_command('run_cascade_jobs', once=True, stdout=StringIO())
+        age(days=40)
+        out = StringIO()
+
+        call_command('purge_deleted_boards', dry_run=True, days=30, stdout=out)
+
+        assert 'Would delete 1 goals.Goal' in out.getvalue()
+        assert Board.objects.filter(id=board.id).exists()
+        assert Goal.objects.filter(id=goal.id).exists()
+
+    def test_skips_recent_and_unfinished(self, auth_client, board, goal, goal_factory, category_factory, user):
+        board, category = board
+        deleted_category = category_factory.create(board=board, user=user)
+        goal_factory.create(category=deleted_category, user=user)
+        auth_client.delete(reverse('goals:retrieve_update_destroy_category', args=[deleted_category.id]))
+        age(days=40)
+
+        assert purge.purge(timezone.now() - timedelta(days=30), chunk_size=10) == {}
+
+        call_command('run_cascade_jobs', once=True, stdout=StringIO())
+        assert purge.purge(timezone.now() - timedelta(days=50), chunk_size=10) == {}
+
+        report = purge.purge(timezone.now() - timedelta(days=30), chunk_size=10)
+
+        assert report['goals.GoalCategory'] == 1
+        assert 'goals.Board' not in report
+        assert set(GoalCategory.objects.values_list('id', flat=True)) == {category.id}
+        assert list(Goal.objects.values_list('id', flat=True)) == [goal.id]
+
+    def test_later_updates_do_not_postpone_purge(self, auth_client, board, user):
+        board, _ = board
+        auth_client.delete(reverse('goals:retrieve_update_destroy_board', args=[board.id]))
+        call_command('run_cascade_jobs', once=True, stdout=StringIO())
+        age(days=40)
+        Board.objects.filter(id=board.id).update(title='Renamed', updated=timezone.now())
+
+        report = purge.purge(timezone.now() - timedelta(days=30), chunk_size=10)
+
+        assert report['goals.Board'] == 1
@@ -0,0 +1,79 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import GoalCategory
+from goals.response_cache import get_board_versions
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    url = reverse('goals:list_of_goals')
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, settings):
+        settings.RESPONSE_CACHE_ENABLED = True
+
+    def test_repeated_request_is_served_from_cache(self, auth_client, goal):
+        first = auth_client.get(self.url, {'ordering': 'due_date'})
+        second = auth_client.get(self.url, {'ordering': 'due_date'})
+
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+
+    def test_goal_change_invalidates_cached_list(self, auth_client, goal):
+        auth_client.get(self.url)
+        auth_client.patch(reverse('goals:retrieve_update_goal', args=[goal.id]), {'title': 'New title'})
+
+        response = auth_client.get(self.url)
+
+        assert response['X-Cache'] == 'MISS'
+        assert response.data[0]['title'] == 'New title'
+
+    def test_category_destroy_invalidates_cached_list(self, auth_client, goal):
+        auth_client.get(self.url)
+        auth_client.delete(reverse('goals:retrieve_update_destroy_category', args=[goal.category_id]))
+
+        response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
+
+    def test_author_rename_invalidates_cached_list(self, auth_client, goal):
+        auth_client.get(self.url)
+        goal.user.first_name = 'Renamed'
+        goal.user.save()
+
+        response = auth_client.get(self.url)
+
+        assert response['X-Cache'] == 'MISS'
+        assert response.data[0]['user']['first_name'] == 'Renamed'
+
+    def test_login_keeps_cached_list(self, auth_client, goal):
+        auth_client.get(self.url)
+        goal.user.save(update_fields=('last_login',))
+
+        assert auth_client.get(self.url)['X-Cache'] == 'HIT'
+
+    def test_category_move_invalidates_previous_board(self, board, alien_board_writer):
+        board, category = board
+        category = GoalCategory.objects.get(id=category.id)
+        version = get_board_versions([board.id])
+
+        category.board = alien_board_writer[0]
+        category.save()
+
+        assert get_board_versions([board.id]) != version
+
+    def test_stats(self, auth_client, goal):
+        auth_client.get(self.url)
+        auth_client.get(self.url)
+        out = StringIO()
+
+        call_command('response_cache_stats', stdout=out)
+
+        assert 'GoalListView: hits=1 misses=1 hit_ratio=0.50' in out.getvalue()
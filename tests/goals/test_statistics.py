@@ -0,0 +1,75 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Goal, GoalStatistic
+
+
+def counts() -> dict[tuple[int, int, int], int]:
+    return {
+        (cell.category_id, cell.status, cell.priority): cell.count
+        for cell in GoalStatistic.objects.filter(count__gt=0)
+    }
+
+
+@pytest.mark.django_db
+class TestGoalStatistics:
+    def test_counts_follow_goal_changes(self, goal_factory, user, board, category_factory):
+        board, category = board
+        goal = goal_factory.create(user=user, category=category, priority=Goal.Priority.low)
+
+        assert counts() == {(category.id, Goal.Status.to_do, Goal.Priority.low): 1}
+
+        goal = Goal.objects.get(id=goal.id)
+        goal.status = Goal.Status.done
+        goal.save()
+        another = category_factory.create(user=user, board=board)
+        goal.category = another
+        goal.save(update_fields=('category',))
+
+        assert counts() == {(another.id, Goal.Status.done, Goal.Priority.low): 1}
+
+        goal.delete()
+
+        assert counts() == {}
+
+    def test_bulk_archive_on_category_delete(self, auth_client, goal, goal_factory, user, board):
+        _, category = board
+        goal_factory.create(user=user, category=category, status=Goal.Status.done)
+
+        response = auth_client.delete(reverse('goals:retrieve_update_destroy_category', args=[category.id]))
+        call_command('run_cascade_jobs', once=True, stdout=StringIO())
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert sum(counts().values()) == 2
+        assert {key[1] for key in counts()} == {Goal.Status.archived}
+
+    def test_summary(self, auth_client, goal, goal_alien_board):
+        response = auth_client.get(reverse('goals:goal_statistics'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{
+            'board': goal.board_id,
+            'total': 1,
+            'by_status': {str(goal.status): 1},
+            'by_priority': {str(goal.priority): 1},
+            'categories': [{
+                'category': goal.category_id,
+                'total': 1,
+                'by_status': {str(goal.status): 1},
+                'by_priority': {str(goal.priority): 1},
+            }],
+        }]
+
+        response = auth_client.get(reverse('goals:goal_statistics'), {'board': goal_alien_board.board_id})
+        assert response.json() == []
+
+    def test_rebuild_repairs_drift(self, goal):
+        GoalStatistic.objects.update(count=10)
+
+        call_command('rebuild_goal_statistics', stdout=StringIO())
+
+        assert counts() == {(goal.category_id, goal.status, goal.priority): 1}
@@ -0,0 +1,48 @@
+import os
+from dataclasses import dataclass
+
+import pytest
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+# Размер набора данных; в CI можно поднять через PERF_SCALE.
+SCALE = int(os.environ.get('PERF_SCALE', 1))
+
+
+@dataclass
+class Dataset:
+    boards: list[Board]
+    categories: list[GoalCategory]
+    goals: list[Goal]
+    comments: list[GoalComment]
+
+
+@pytest.fixture
+def dataset(user, user_factory, board_factory, board_participant_factory, category_factory, goal_factory,
+            comment_factory) -> Dataset:
+    """Доски пользователя с разными ролями, чужими участниками, категориями, целями и комментариями."""
+    authors = user_factory.create_batch(5)
+    roles = (BoardParticipant.Role.owner, BoardParticipant.Role.writer, BoardParticipant.Role.reader)
+    boards, categories, goals, comments = [], [], [], []
+
+    for index in range(6 * SCALE):
+        board = board_factory.create()
+        board_participant_factory.create(board=board, user=user, role=roles[index % len(roles)])
+        for author in authors[:index % len(authors) + 1]:
+            board_participant_factory.create(board=board, user=author, role=BoardParticipant.Role.writer)
+        boards.append(board)
+
+        for _ in range(3):
+            category = category_factory.create(board=board, user=authors[index % len(authors)])
+            categories.append(category)
+            for number in range(8):
+                goal = goal_factory.create(
+                    category=category,
+                    user=authors[number % len(authors)],
+                    status=number % 3 + 1,
+                    priority=number % 4 + 1,
+                )
+                goals.append(goal)
+                comments.append(comment_factory.create(goal=goal, user=authors[(number + 1) % len(authors)]))
+
+    return Dataset(boards=boards, categories=categories, goals=goals, comments=comments)
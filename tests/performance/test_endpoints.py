@@ -0,0 +1,105 @@
+"""
+Регрессионные проверки производительности REST API.
+
+Число SQL-запросов каждого endpoint'а ограничено сверху и не зависит от размера страницы.
+Перцентили задержки сравниваются с baseline.json (по вендору БД) с запасом PERF_TOLERANCE.
+С PERF_UPDATE_BASELINE=1 тест перезаписывает baseline. С PERF_RESULTS=<path> он сохраняет
+текущие замеры, например как артефакт CI.
+"""
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tests.performance.conftest import Dataset
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+TOLERANCE = float(os.environ.get('PERF_TOLERANCE', 5))
+# Абсолютный запас в мс: быстрые endpoint'ы слишком чувствительны к шуму, чтобы сравнивать только в разах.
+SLACK_MS = float(os.environ.get('PERF_SLACK_MS', 20))
+ROUNDS = int(os.environ.get('PERF_ROUNDS', 15))
+
+# name: (url по набору данных, постраничный ли список, предел числа запросов)
+# Пределы goals включают чтение ролей из БД: кеш ролей по умолчанию выключен (MEMBERSHIP_CACHE_ENABLED).
+ENDPOINTS: dict[str, tuple[Callable[[Dataset], str], bool, int]] = {
+    'goal_list': (lambda data: reverse('goals:list_of_goals'), True, 6),
+    'goal_detail': (lambda data: reverse('goals:retrieve_update_goal', args=[data.goals[0].id]), False, 4),
+    'goal_statistics': (lambda data: reverse('goals:goal_statistics'), False, 4),
+    'category_list': (lambda data: reverse('goals:list_of_categories'), True, 6),
+    'category_detail': (
+        lambda data: reverse('goals:retrieve_update_destroy_category', args=[data.categories[0].id]), False, 4
+    ),
+    'comment_list': (lambda data: reverse('goals:list_of_comments'), True, 6),
+    'comment_detail': (
+        lambda data: reverse('goals:retrieve_update_destroy_comment', args=[data.comments[0].id]), False, 4
+    ),
+    'board_list': (lambda data: reverse('goals:board_list'), True, 6),
+    'board_detail': (
+        lambda data: reverse('goals:retrieve_update_destroy_board', args=[data.boards[0].id]), False, 6
+    ),
+    'profile': (lambda data: reverse('core:profile-view'), False, 2),
+}
+
+
+def count_queries(client, url: str, params: dict | None = None) -> int:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == 200, url
+    return len(context)
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': round(cuts[49], 2), 'p95': round(cuts[94], 2), 'max': round(max(samples), 2)}
+
+
+@pytest.mark.django_db
+class TestEndpointPerformance:
+    @pytest.mark.parametrize('name', ENDPOINTS)
+    def test_query_count(self, auth_client, dataset, name):
+        url_for, paginated, max_queries = ENDPOINTS[name]
+        url = url_for(dataset)
+        auth_client.get(url)  # прогревает кеши
+
+        if paginated:
+            small, large = count_queries(auth_client, url, {'limit': 5}), count_queries(auth_client, url, {'limit': 50})
+            assert small == large, f'{name}: {small} queries for 5 rows, {large} for 50'
+        else:
+            large = count_queries(auth_client, url)
+        assert large <= max_queries, f'{name}: {large} queries, limit {max_queries}'
+
+    def test_latency(self, auth_client, dataset):
+        results: dict[str, dict[str, float]] = {}
+        for name, (url_for, paginated, _) in ENDPOINTS.items():
+            url, params = url_for(dataset), {'limit': 50} if paginated else None
+            auth_client.get(url, params)
+            samples = []
+            for _ in range(ROUNDS):
+                started = time.perf_counter()
+                auth_client.get(url, params)
+                samples.append((time.perf_counter() - started) * 1000)
+            results[name] = percentiles(samples)
+
+        if path := os.environ.get('PERF_RESULTS'):
+            Path(path).write_text(json.dumps({connection.vendor: results}, indent=2, sort_keys=True))
+
+        baseline: dict = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        if os.environ.get('PERF_UPDATE_BASELINE'):
+            baseline[connection.vendor] = results
+            BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+            return
+
+        regressions = [
+            f'{name}: p95 {result["p95"]} ms, baseline {expected["p95"]} ms'
+            for name, result in results.items()
+            if (expected := baseline.get(connection.vendor, {}).get(name))
+            and result['p95'] > expected['p95'] * TOLERANCE + SLACK_MS
+        ]
+        assert not regressions, regressions
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'social_django',
     'rest_framework',
     'django_filters',
@@ -153,11 +154,64 @@ SOCIAL_AUTH_VK_EXTRA_DATA = [
 
 SOCIAL_AUTH_USER_MODEL = 'core.User'
 
+CACHES = {
+    'default': {
+        'BACKEND': env('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': env('CACHE_LOCATION', default=''),
+    }
+}
+
+# Кеш ролей участников досок между запросами. Включать только с общим для всех процессов CACHE_BACKEND
+# (Redis, Memcached): сброс локального кеша при смене ролей не доходит до остальных воркеров gunicorn.
+# Без него роли читаются из БД один раз за запрос.
+MEMBERSHIP_CACHE_ENABLED = env.bool('MEMBERSHIP_CACHE_ENABLED', default=False)
+MEMBERSHIP_CACHE_ALIAS = 'default'
+MEMBERSHIP_CACHE_TIMEOUT = env.int('MEMBERSHIP_CACHE_TIMEOUT', default=60 * 60)
+
+# Кеш ответов списков goals; с несколькими процессами нужен общий для них CACHE_BACKEND.
+RESPONSE_CACHE_ENABLED = env.bool('RESPONSE_CACHE_ENABLED', default=False)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=5 * 60)
+
+# Поиск целей по tsvector-колонке с GIN-индексом; работает только на PostgreSQL, иначе — ILIKE SearchFilter'а.
+# После включения заполните колонку: manage.py rebuild_search_vectors.
+GOAL_FULL_TEXT_SEARCH = env.bool('GOAL_FULL_TEXT_SEARCH', default=False)
+GOAL_SEARCH_CONFIG = env('GOAL_SEARCH_CONFIG', default='russian')
+GOAL_BATCH_MAX_SIZE = env.int('GOAL_BATCH_MAX_SIZE', default=500)
+# Целей в одном bulk_create при импорте из файла (goal/import, manage.py import_goals).
+GOAL_IMPORT_BATCH_SIZE = env.int('GOAL_IMPORT_BATCH_SIZE', default=500)
+
+# Цели в статусе «Архив» старше стольких дней archive_old_goals переносит в архивные таблицы.
+GOAL_COLD_STORAGE_AFTER_DAYS = env.int('GOAL_COLD_STORAGE_AFTER_DAYS', default=90)
+
+# Строк, читаемых из БД за раз при потоковой выгрузке goals/export/<формат>.
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Удалённые доски и категории старше стольких дней purge_deleted_boards удаляет из БД физически.
+PURGE_DELETED_AFTER_DAYS = env.int('PURGE_DELETED_AFTER_DAYS', default=30)
+
+# Фоновая архивация целей удалённых досок и категорий (manage.py run_cascade_jobs).
+CASCADE_CHUNK_SIZE = env.int('CASCADE_CHUNK_SIZE', default=500)
+CASCADE_MAX_ATTEMPTS = env.int('CASCADE_MAX_ATTEMPTS', default=5)
+CASCADE_RETRY_DELAY = env.int('CASCADE_RETRY_DELAY', default=30)
+# Задача в статусе running дольше этого времени считается брошенной упавшим воркером.
+CASCADE_LOCK_TIMEOUT = env.int('CASCADE_LOCK_TIMEOUT', default=10 * 60)
+
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
 }
 
 BOT_TOKEN = env('BOT_TOKEN')
+BOT_CONCURRENCY = env.int('BOT_CONCURRENCY', default=8)
+BOT_CHAT_IDLE_TIMEOUT = env.int('BOT_CHAT_IDLE_TIMEOUT', default=300)
+# Лимиты Telegram: около 30 сообщений в секунду всего и 1 в секунду на чат.
+BOT_GLOBAL_RATE = env.float('BOT_GLOBAL_RATE', default=30)
+BOT_CHAT_RATE = env.float('BOT_CHAT_RATE', default=1)
+BOT_STATE_TTL = env.int('BOT_STATE_TTL', default=15 * 60)
+# Кеш TgUser по chat_id; включать (> 0) только с общим для всех процессов CACHE_BACKEND.
+BOT_TG_USER_CACHE_TTL = env.int('BOT_TG_USER_CACHE_TTL', default=0)
+# Секрет webhook'а (secret_token в setWebhook); пустое значение отключает webhook.
+BOT_WEBHOOK_SECRET = env('BOT_WEBHOOK_SECRET', default='')
 
 
 # logging
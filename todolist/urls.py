@@ -1,13 +1,14 @@
 from django.contrib import admin
 from django.urls import path, include
 
-from bot.views import BotVerificationView
+from bot.views import BotVerificationView, BotWebhookView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('core/', include(('core.urls', 'core'))),
     path('goals/', include(('goals.urls', 'goals'))),
     path('bot/verify', BotVerificationView.as_view(), name='telegram_verify'),
+    path('bot/webhook', BotWebhookView.as_view(), name='telegram_webhook'),
 
 
     path('oauth/', include('social_django.urls', namespace='social'))